@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import json
 from math import log2
 from typing import Iterable, Protocol
@@ -25,6 +26,15 @@ class Alert:
         return json.dumps(self.evidence, ensure_ascii=False, sort_keys=True)
 
 
+@dataclass
+class _WeekPlays:
+    """Per-week tallies shared by every detector, filled in one pass."""
+
+    plays: int = 0
+    track_counts: Counter[str] = field(default_factory=Counter)
+    hour_counts: list[int] = field(default_factory=lambda: [0] * 24)
+
+
 DATE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S")
 DERIVA_TOP_N = 5
 DERIVA_JACCARD_THRESHOLD = 0.3
@@ -47,17 +57,29 @@ def detect_alerts(streams: Iterable[StreamLike]) -> list[Alert]:
     return alerts
 
 
-def _group_by_week(streams: Iterable[StreamLike]) -> dict[datetime, list[StreamLike]]:
-    grouped: dict[datetime, list[StreamLike]] = defaultdict(list)
+def _group_by_week(streams: Iterable[StreamLike]) -> dict[datetime, _WeekPlays]:
+    grouped: dict[datetime, _WeekPlays] = defaultdict(_WeekPlays)
     for stream in streams:
         parsed = _parse_end_time(stream.end_time)
         if parsed is None:
             continue
-        week_start = parsed.date() - timedelta(days=parsed.weekday())
-        grouped[datetime.combine(week_start, datetime.min.time())].append(stream)
+        week = grouped[_week_start_from_ordinal(parsed.toordinal())]
+        week.plays += 1
+        week.track_counts[stream.track_key] += 1
+        week.hour_counts[parsed.hour] += 1
     return grouped
 
 
+# Many plays share a day, so each day's week start is computed once.
+@lru_cache(maxsize=4096)
+def _week_start_from_ordinal(ordinal: int) -> datetime:
+    day = date.fromordinal(ordinal)
+    week_start = day - timedelta(days=day.weekday())
+    return datetime.combine(week_start, datetime.min.time())
+
+
+# Exports repeat the same minute-resolution timestamps many times over.
+@lru_cache(maxsize=65_536)
 def _parse_end_time(value: str) -> datetime | None:
     for fmt in DATE_FORMATS:
         try:
@@ -67,15 +89,15 @@ def _parse_end_time(value: str) -> datetime | None:
     return None
 
 
-def _detect_deriva(streams_by_week: dict[datetime, list[StreamLike]]) -> list[Alert]:
+def _detect_deriva(streams_by_week: dict[datetime, _WeekPlays]) -> list[Alert]:
     alerts: list[Alert] = []
     weeks = sorted(streams_by_week.keys())
     weekly_top_sets: dict[datetime, set[str]] = {}
     weekly_counts: dict[datetime, int] = {}
 
     for week in weeks:
-        counts = Counter(stream.track_key for stream in streams_by_week[week])
-        weekly_counts[week] = sum(counts.values())
+        counts = streams_by_week[week].track_counts
+        weekly_counts[week] = streams_by_week[week].plays
         weekly_top_sets[week] = {
             track_key for track_key, _ in counts.most_common(DERIVA_TOP_N)
         }
@@ -110,11 +132,11 @@ def _detect_deriva(streams_by_week: dict[datetime, list[StreamLike]]) -> list[Al
     return alerts
 
 
-def _detect_bloqueo(streams_by_week: dict[datetime, list[StreamLike]]) -> list[Alert]:
+def _detect_bloqueo(streams_by_week: dict[datetime, _WeekPlays]) -> list[Alert]:
     alerts: list[Alert] = []
-    for week_start, week_streams in streams_by_week.items():
-        counts = Counter(stream.track_key for stream in week_streams)
-        total = sum(counts.values())
+    for week_start, week in streams_by_week.items():
+        counts = week.track_counts
+        total = week.plays
         if total < BLOCKED_MIN_PLAYS or not counts:
             continue
         top_track, top_count = counts.most_common(1)[0]
@@ -138,20 +160,13 @@ def _detect_bloqueo(streams_by_week: dict[datetime, list[StreamLike]]) -> list[A
     return alerts
 
 
-def _detect_caos(streams_by_week: dict[datetime, list[StreamLike]]) -> list[Alert]:
+def _detect_caos(streams_by_week: dict[datetime, _WeekPlays]) -> list[Alert]:
     alerts: list[Alert] = []
-    for week_start, week_streams in streams_by_week.items():
-        hours: list[int] = []
-        for stream in week_streams:
-            parsed = _parse_end_time(stream.end_time)
-            if parsed is None:
-                continue
-            hours.append(parsed.hour)
-        if len(hours) < CAOS_MIN_PLAYS:
+    for week_start, week in streams_by_week.items():
+        total = week.plays
+        if total < CAOS_MIN_PLAYS:
             continue
-        counts = Counter(hours)
-        total = sum(counts.values())
-        entropy = _entropy(counts.values(), total)
+        entropy = _entropy(week.hour_counts, total)
         normalized_entropy = entropy / log2(24)
         if normalized_entropy >= CAOS_ENTROPY_THRESHOLD:
             alerts.append(
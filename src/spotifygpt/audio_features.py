@@ -292,6 +292,16 @@ def init_audio_feature_tables(connection: sqlite3.Connection) -> None:
     for column in ("loudness", "acousticness", "instrumentalness", "speechiness"):
         if column not in existing_columns:
             connection.execute(f"ALTER TABLE audio_features ADD COLUMN {column} REAL")
+    # Covers the profile feature joins so they never touch the table rows.
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_audio_features_covering
+        ON audio_features (
+            track_key, energy, valence, danceability, tempo,
+            loudness, acousticness, instrumentalness, speechiness
+        )
+        """
+    )
     connection.execute(
         """
         CREATE TABLE IF NOT EXISTS audio_feature_cache (
@@ -383,6 +393,16 @@ def _insert_audio_feature(connection: sqlite3.Connection, feature: AudioFeatures
     )
 
 
+def _refresh_audio_feature_stats(connection: sqlite3.Connection) -> None:
+    # Without stats the planner joins through the primary-key index and reads
+    # every table row; once analyzed it uses the covering feature index. The
+    # backfill is the writer, so it refreshes them and profile reads stay
+    # side-effect free.
+    connection.execute("PRAGMA analysis_limit=1000")
+    connection.execute("ANALYZE audio_features")
+    connection.commit()
+
+
 def backfill_audio_features(
     connection: sqlite3.Connection,
     provider: AudioFeatureProvider,
@@ -484,6 +504,8 @@ def backfill_audio_features(
                 inserted += 1
 
         connection.commit()
+        if inserted:
+            _refresh_audio_feature_stats(connection)
         return BackfillResult(
             scanned=len(candidates),
             inserted=inserted,
@@ -506,6 +528,8 @@ def backfill_audio_features(
         inserted += 1
 
     connection.commit()
+    if inserted:
+        _refresh_audio_feature_stats(connection)
 
     return BackfillResult(
         scanned=len(candidates),
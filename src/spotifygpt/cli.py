@@ -653,9 +653,13 @@ def main(argv: list[str] | None = None) -> int:
         init_db(connection)
 
         if args.command == "sync":
-            service = SyncService(SpotifyAPIClient(token=args.token))
-            service.init_db(connection)
-            summary = service.run_standard_sync(connection, args.since)
+            client = SpotifyAPIClient(token=args.token)
+            try:
+                service = SyncService(client)
+                service.init_db(connection)
+                summary = service.run_standard_sync(connection, args.since)
+            finally:
+                client.close()
             print(
                 "Sync run "
                 f"#{summary.run_id} complete: saved={summary.saved_tracks}, "
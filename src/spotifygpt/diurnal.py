@@ -31,6 +31,22 @@ _WEEKEND_SCHEDULE: tuple[tuple[str, int, int], ...] = (
     (NIGHT, 1320, 1439),
 )
 
+
+def _minute_table(schedule: tuple[tuple[str, int, int], ...]) -> tuple[str, ...]:
+    table: list[str] = [""] * 1440
+    for block, start_minute, end_minute in schedule:
+        table[start_minute : end_minute + 1] = [block] * (end_minute - start_minute + 1)
+    # Checked once at import: every minute must map to a block, as the
+    # schedule scan this replaced guaranteed by raising on a gap.
+    if "" in table:
+        raise RuntimeError(f"Unsupported minute_of_day value: {table.index('')}")
+    return tuple(table)
+
+
+# Pre-sized per-minute lookups so classifying a moment is a single index.
+_WEEKDAY_BLOCKS = _minute_table(_WEEKDAY_SCHEDULE)
+_WEEKEND_BLOCKS = _minute_table(_WEEKEND_SCHEDULE)
+
 _FEATURE_PRIORS: dict[str, dict[str, float]] = {
     MORNING: {
         "energy": 0.62,
@@ -72,12 +88,8 @@ _FEATURE_PRIORS: dict[str, dict[str, float]] = {
 
 def get_time_block(moment: datetime) -> str:
     """Map a datetime to a deterministic diurnal time block."""
-    schedule = _WEEKEND_SCHEDULE if moment.weekday() >= 5 else _WEEKDAY_SCHEDULE
-    minute_of_day = moment.hour * 60 + moment.minute
-    for block, start_minute, end_minute in schedule:
-        if start_minute <= minute_of_day <= end_minute:
-            return block
-    raise RuntimeError(f"Unsupported minute_of_day value: {minute_of_day}")
+    blocks = _WEEKEND_BLOCKS if moment.weekday() >= 5 else _WEEKDAY_BLOCKS
+    return blocks[moment.hour * 60 + moment.minute]
 
 
 def get_feature_prior(block: str) -> dict[str, float]:
@@ -119,7 +119,7 @@ def insert_streams(connection: sqlite3.Connection, streams: Iterable[Stream]) ->
         INSERT INTO streams (track_key, track_name, artist_name, end_time, ms_played)
         VALUES (?, ?, ?, ?, ?)
         """,
-        [
+        (
             (
                 stream.track_key,
                 stream.track_name,
@@ -128,7 +128,7 @@ def insert_streams(connection: sqlite3.Connection, streams: Iterable[Stream]) ->
                 stream.ms_played,
             )
             for stream in streams
-        ],
+        ),
     )
     connection.commit()
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from hashlib import sha256
 import json
 from datetime import datetime, timezone
@@ -54,6 +55,9 @@ class DeepImportResult:
     run_id: int
 
 
+# Listening histories replay the same track/artist pairs many times, so hash each
+# pair once per process instead of once per row.
+@lru_cache(maxsize=65_536)
 def compute_track_key(track_name: str, artist_name: str) -> str:
     raw_key = f"{track_name}|{artist_name}".encode("utf-8")
     return sha256(raw_key).hexdigest()
@@ -191,17 +195,13 @@ def init_db(connection) -> None:
 
 
 def _compute_dedup_key(row: dict[str, object]) -> str:
-    payload = "|".join(
-        [
-            str(row.get("ts", "")),
-            str(row.get("master_metadata_track_name", "")),
-            str(row.get("master_metadata_album_artist_name", "")),
-            str(row.get("ms_played", "")),
-            str(row.get("spotify_track_uri", "")),
-            str(row.get("platform", "")),
-            str(row.get("reason_end", "")),
-            str(row.get("conn_country", "")),
-        ]
+    # Byte-identical to "|".join(str(value) ...) so stored dedup keys stay valid.
+    get = row.get
+    payload = (
+        f"{get('ts', '')}|{get('master_metadata_track_name', '')}|"
+        f"{get('master_metadata_album_artist_name', '')}|{get('ms_played', '')}|"
+        f"{get('spotify_track_uri', '')}|{get('platform', '')}|"
+        f"{get('reason_end', '')}|{get('conn_country', '')}"
     )
     return sha256(payload.encode("utf-8")).hexdigest()
 
@@ -231,14 +231,28 @@ def _parse_deep_row(row: dict[str, object]) -> ListeningEvent | None:
     )
 
 
-def _load_deep_json_bytes(payload: bytes) -> list[dict[str, object]]:
+def _load_deep_json_bytes(payload: bytes) -> list[object]:
     try:
         parsed = json.loads(payload.decode("utf-8"))
     except (UnicodeDecodeError, json.JSONDecodeError):
         return []
     if not isinstance(parsed, list):
         return []
-    return [row for row in parsed if isinstance(row, dict)]
+    return parsed
+
+
+def _collect_deep_events(rows: list[object], events: list[ListeningEvent]) -> int:
+    # Non-object entries are skipped here rather than filtered into a copy of
+    # the parsed array first, so each file's rows are walked exactly once.
+    rows_seen = 0
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        rows_seen += 1
+        event = _parse_deep_row(row)
+        if event is not None:
+            events.append(event)
+    return rows_seen
 
 
 def _discover_deep_files_dir(input_path: Path) -> list[Path]:
@@ -257,22 +271,12 @@ def _load_deep_rows(input_path: Path) -> tuple[list[str], list[ListeningEvent],
             )
             for name in names:
                 files.append(name)
-                rows = _load_deep_json_bytes(archive.read(name))
-                rows_seen += len(rows)
-                for row in rows:
-                    event = _parse_deep_row(row)
-                    if event is not None:
-                        events.append(event)
+                rows_seen += _collect_deep_events(_load_deep_json_bytes(archive.read(name)), events)
         return files, events, rows_seen
 
     for file in _discover_deep_files_dir(input_path):
         files.append(str(file))
-        rows = _load_deep_json_bytes(file.read_bytes())
-        rows_seen += len(rows)
-        for row in rows:
-            event = _parse_deep_row(row)
-            if event is not None:
-                events.append(event)
+        rows_seen += _collect_deep_events(_load_deep_json_bytes(file.read_bytes()), events)
 
     return files, events, rows_seen
 
@@ -290,22 +294,22 @@ def import_gdpr(connection, input_path: Path | str) -> DeepImportResult:
     run_id = int(cursor.lastrowid)
 
     files, events, rows_seen = _load_deep_rows(Path(input_path))
-    rows = [
+    # executemany pulls parameters lazily, so stream tuples instead of
+    # materializing a second list alongside ``events``.
+    rows = (
         (e.event_ts, e.track_name, e.artist_name, e.ms_played, e.track_key, e.dedup_key)
         for e in events
-    ]
-    inserted = 0
-    if rows:
-        before = connection.total_changes
-        connection.executemany(
-            """
-            INSERT OR IGNORE INTO listening_events (
-                event_ts, track_name, artist_name, ms_played, track_key, dedup_key
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            rows,
-        )
-        inserted = connection.total_changes - before
+    )
+    before = connection.total_changes
+    connection.executemany(
+        """
+        INSERT OR IGNORE INTO listening_events (
+            event_ts, track_name, artist_name, ms_played, track_key, dedup_key
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    inserted = connection.total_changes - before
 
     finished_at = datetime.now(timezone.utc).isoformat()
     connection.execute(
@@ -49,9 +49,8 @@ def collect_ingest_status(connection: sqlite3.Connection) -> IngestStatus:
         warnings.append("Missing table: audio_features")
 
     if _table_exists(connection, "listening_events"):
-        listening_events = _count_rows(connection, "listening_events")
-        listening_min_date, listening_max_date = connection.execute(
-            "SELECT MIN(played_at), MAX(played_at) FROM listening_events"
+        listening_events, listening_min_date, listening_max_date = connection.execute(
+            "SELECT COUNT(*), MIN(played_at), MAX(played_at) FROM listening_events"
         ).fetchone()
     else:
         warnings.append("Missing table: listening_events")
@@ -169,60 +169,65 @@ def init_manual_import_tables(connection: sqlite3.Connection) -> None:
     connection.commit()
 
 
-def _upsert_track(connection: sqlite3.Connection, track: ManualTrack) -> int:
+# Statement text is shared across calls so sqlite3's per-connection statement
+# cache serves the prepared statements instead of re-parsing them per track.
+_UPSERT_TRACK_SQL = """
+    INSERT INTO tracks (spotify_uri, track_name, artist_name, track_key)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(track_key) DO UPDATE SET spotify_uri = COALESCE(excluded.spotify_uri, tracks.spotify_uri)
+"""
+_SELECT_TRACK_ID_SQL = "SELECT id FROM tracks WHERE track_key = ?"
+_UPSERT_LIBRARY_SQL = """
+    INSERT OR REPLACE INTO library (track_id, added_at)
+    VALUES (?, ?)
+"""
+_INSERT_PLAYLIST_SQL = """
+    INSERT OR IGNORE INTO playlists (name)
+    VALUES (?)
+"""
+_SELECT_PLAYLIST_ID_SQL = "SELECT id FROM playlists WHERE name = ?"
+_UPSERT_PLAYLIST_TRACK_SQL = """
+    INSERT OR REPLACE INTO playlist_tracks (playlist_id, track_id, position, added_at)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _upsert_track(cursor: sqlite3.Cursor, track: ManualTrack) -> int:
     track_key = compute_track_key(track.track_name, track.artist_name)
-    connection.execute(
-        """
-        INSERT INTO tracks (spotify_uri, track_name, artist_name, track_key)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(track_key) DO UPDATE SET spotify_uri = COALESCE(excluded.spotify_uri, tracks.spotify_uri)
-        """,
+    cursor.execute(
+        _UPSERT_TRACK_SQL,
         (track.spotify_uri, track.track_name, track.artist_name, track_key),
     )
-    row = connection.execute("SELECT id FROM tracks WHERE track_key = ?", (track_key,)).fetchone()
+    row = cursor.execute(_SELECT_TRACK_ID_SQL, (track_key,)).fetchone()
     return int(row[0])
 
 
 def store_manual_payload(connection: sqlite3.Connection, payload: ManualImportPayload) -> ManualImportResult:
+    now_iso = _now_iso()
     track_ids: set[int] = set()
     library_rows = 0
     playlist_rows = 0
     playlist_track_rows = 0
 
+    cursor = connection.cursor()
+
     for track in payload.liked_tracks:
-        track_id = _upsert_track(connection, track)
+        track_id = _upsert_track(cursor, track)
         track_ids.add(track_id)
-        connection.execute(
-            """
-            INSERT OR REPLACE INTO library (track_id, added_at)
-            VALUES (?, ?)
-            """,
-            (track_id, track.added_at or _now_iso()),
-        )
+        cursor.execute(_UPSERT_LIBRARY_SQL, (track_id, track.added_at or now_iso))
         library_rows += 1
 
     for playlist in payload.playlists:
-        connection.execute(
-            """
-            INSERT OR IGNORE INTO playlists (name)
-            VALUES (?)
-            """,
-            (playlist.name,),
-        )
-        playlist_id = int(
-            connection.execute("SELECT id FROM playlists WHERE name = ?", (playlist.name,)).fetchone()[0]
-        )
+        cursor.execute(_INSERT_PLAYLIST_SQL, (playlist.name,))
+        playlist_id = int(cursor.execute(_SELECT_PLAYLIST_ID_SQL, (playlist.name,)).fetchone()[0])
         playlist_rows += 1
 
         for position, track in enumerate(playlist.tracks, start=1):
-            track_id = _upsert_track(connection, track)
+            track_id = _upsert_track(cursor, track)
             track_ids.add(track_id)
-            connection.execute(
-                """
-                INSERT OR REPLACE INTO playlist_tracks (playlist_id, track_id, position, added_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (playlist_id, track_id, position, track.added_at or _now_iso()),
+            cursor.execute(
+                _UPSERT_PLAYLIST_TRACK_SQL,
+                (playlist_id, track_id, position, track.added_at or now_iso),
             )
             playlist_track_rows += 1
 
@@ -2,22 +2,15 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timedelta
 
-
-@dataclass(frozen=True)
-class StreamRecord:
-    track_key: str
-    track_name: str
-    artist_name: str
-    end_time: datetime
-    ms_played: int
+# Repetition score is sum(weight) / unique_tracks with a per-play weight of
+# 1 / (1 + days_since_play); days_since floors like timedelta.days because
+# every play is at or before its reference time.
+_RECENCY_WEIGHT_SQL = "1.0 / (1 + (ref_ts - ts) / 86400)"
 
 
 def init_metrics_tables(connection) -> None:
-    connection.execute(
+    connection.executescript(
         """
         CREATE TABLE IF NOT EXISTS track_aggregates (
             track_key TEXT PRIMARY KEY,
@@ -28,29 +21,20 @@ def init_metrics_tables(connection) -> None:
             avg_ms_played REAL NOT NULL,
             plays_over_60s INTEGER NOT NULL,
             persistence_proxy REAL NOT NULL
-        )
-        """
-    )
-    connection.execute(
-        """
+        );
+
         CREATE TABLE IF NOT EXISTS metrics_global (
             metric_name TEXT PRIMARY KEY,
             metric_value REAL NOT NULL
-        )
-        """
-    )
-    connection.execute(
-        """
+        );
+
         CREATE TABLE IF NOT EXISTS metrics_weekly (
             week_start TEXT NOT NULL,
             metric_name TEXT NOT NULL,
             metric_value REAL NOT NULL,
             PRIMARY KEY (week_start, metric_name)
-        )
-        """
-    )
-    connection.execute(
-        """
+        );
+
         CREATE TABLE IF NOT EXISTS temporal_distributions (
             scope TEXT NOT NULL,
             week_start TEXT,
@@ -58,65 +42,35 @@ def init_metrics_tables(connection) -> None:
             bucket INTEGER NOT NULL,
             play_count INTEGER NOT NULL,
             PRIMARY KEY (scope, week_start, bucket_type, bucket)
-        )
-        """
-    )
-    connection.commit()
-
+        );
 
-def _parse_end_time(value: str) -> datetime:
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+        -- Same per-track index the pipeline creates: it carries the name
+        -- columns (and the rowid behind MIN(id)), so the track_aggregates
+        -- GROUP BY reads it in key order without touching table rows.
+        CREATE INDEX IF NOT EXISTS idx_streams_track
+        ON streams (track_key, track_name, artist_name, ms_played);
 
-
-def _week_start(date_value: datetime) -> str:
-    monday = date_value.date() - timedelta(days=date_value.weekday())
-    return monday.isoformat()
-
-
-def _load_streams(connection) -> list[StreamRecord]:
-    rows = connection.execute(
-        """
-        SELECT track_key, track_name, artist_name, end_time, ms_played
-        FROM streams
+        -- Lets the parsed_plays pass read end_time and track_key off an index.
+        CREATE INDEX IF NOT EXISTS idx_streams_end_time
+        ON streams (end_time, track_key, ms_played);
         """
-    ).fetchall()
-    records: list[StreamRecord] = []
-    for track_key, track_name, artist_name, end_time, ms_played in rows:
-        records.append(
-            StreamRecord(
-                track_key=track_key,
-                track_name=track_name,
-                artist_name=artist_name,
-                end_time=_parse_end_time(end_time),
-                ms_played=ms_played,
-            )
-        )
-    return records
+    )
 
 
-def _recency_weighted_repetition_score(records: list[StreamRecord]) -> float:
-    """
-    Compute recency-weighted repetition score.
+def _refresh_stream_stats(connection) -> None:
+    # Re-run on every rebuild so the planner's stats follow the table as
+    # imports grow it; analysis_limit keeps it to a sampled pass per index.
+    if connection.execute("SELECT 1 FROM streams LIMIT 1").fetchone():
+        connection.execute("PRAGMA analysis_limit=1000")
+        connection.execute("ANALYZE streams")
 
-    Formula:
-        weight = 1 / (1 + days_since_play)
-        repetition_score = sum(weight for each play) / unique_tracks
-    """
 
-    if not records:
-        return 0.0
-    reference_time = max(record.end_time for record in records)
-    unique_tracks = {record.track_key for record in records}
-    if not unique_tracks:
-        return 0.0
-    weighted_total = 0.0
-    for record in records:
-        days_since = (reference_time - record.end_time).days
-        weighted_total += 1 / (1 + days_since)
-    return weighted_total / len(unique_tracks)
+def _configure_for_rebuild(connection) -> None:
+    # journal_mode cannot change inside a transaction, so this runs first.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-65536")
 
 
 def _clear_existing_metrics(connection) -> None:
@@ -127,158 +81,101 @@ def _clear_existing_metrics(connection) -> None:
         "temporal_distributions",
     ):
         connection.execute(f"DELETE FROM {table}")
-    connection.commit()
-
-
-def compute_and_store_metrics(connection) -> None:
-    init_metrics_tables(connection)
-    records = _load_streams(connection)
-    _clear_existing_metrics(connection)
-
-    if not records:
-        connection.executemany(
-            """
-            INSERT INTO metrics_global (metric_name, metric_value)
-            VALUES (?, ?)
-            """,
-            [
-                ("rotation", 0.0),
-                ("repetition_score", 0.0),
-            ],
-        )
-        connection.commit()
-        return
 
-    track_stats: dict[str, dict[str, float]] = {}
-    for record in records:
-        stats = track_stats.setdefault(
-            record.track_key,
-            {
-                "track_name": record.track_name,
-                "artist_name": record.artist_name,
-                "play_count": 0,
-                "total_ms_played": 0,
-                "plays_over_60s": 0,
-            },
-        )
-        stats["play_count"] += 1
-        stats["total_ms_played"] += record.ms_played
-        if record.ms_played >= 60_000:
-            stats["plays_over_60s"] += 1
 
-    track_rows = []
-    for track_key, stats in track_stats.items():
-        play_count = int(stats["play_count"])
-        total_ms = int(stats["total_ms_played"])
-        plays_over_60s = int(stats["plays_over_60s"])
-        avg_ms = total_ms / play_count if play_count else 0.0
-        persistence = plays_over_60s / play_count if play_count else 0.0
-        track_rows.append(
-            (
-                track_key,
-                stats["track_name"],
-                stats["artist_name"],
-                play_count,
-                total_ms,
-                avg_ms,
-                plays_over_60s,
-                persistence,
-            )
-        )
+def _create_parsed_plays(connection) -> None:
+    """Materialise each stream's end_time as integers, parsed exactly once."""
 
-    connection.executemany(
+    # Hour and date come straight from the stored text so they match
+    # datetime.hour / datetime.weekday() without SQLite's UTC normalisation.
+    connection.execute("DROP TABLE IF EXISTS temp.parsed_plays")
+    connection.execute(
         """
-        INSERT INTO track_aggregates (
+        CREATE TEMP TABLE parsed_plays AS
+        SELECT
             track_key,
-            track_name,
-            artist_name,
-            play_count,
-            total_ms_played,
-            avg_ms_played,
-            plays_over_60s,
-            persistence_proxy
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        track_rows,
-    )
-
-    total_plays = len(records)
-    unique_tracks = len(track_stats)
-    rotation = unique_tracks / total_plays if total_plays else 0.0
-    repetition_score = _recency_weighted_repetition_score(records)
-
-    connection.executemany(
+            CAST(strftime('%s', end_time) AS INTEGER) AS ts,
+            CAST(substr(end_time, 12, 2) AS INTEGER) AS hour,
+            (CAST(strftime('%w', substr(end_time, 1, 10)) AS INTEGER) + 6) % 7
+                AS weekday,
+            date(substr(end_time, 1, 10), '-6 days', 'weekday 1') AS week_start
+        FROM streams
         """
-        INSERT INTO metrics_global (metric_name, metric_value)
-        VALUES (?, ?)
-        """,
-        [
-            ("rotation", rotation),
-            ("repetition_score", repetition_score),
-        ],
     )
 
-    hour_counts: dict[int, int] = defaultdict(int)
-    weekday_counts: dict[int, int] = defaultdict(int)
-    for record in records:
-        hour_counts[record.end_time.hour] += 1
-        weekday_counts[record.end_time.weekday()] += 1
-
-    temporal_rows = [
-        ("global", None, "hour", hour, count)
-        for hour, count in sorted(hour_counts.items())
-    ] + [
-        ("global", None, "day_of_week", day, count)
-        for day, count in sorted(weekday_counts.items())
-    ]
 
-    weekly_groups: dict[str, list[StreamRecord]] = defaultdict(list)
-    for record in records:
-        weekly_groups[_week_start(record.end_time)].append(record)
-
-    weekly_metric_rows = []
-    weekly_temporal_rows = []
-    for week_start, week_records in weekly_groups.items():
-        week_total = len(week_records)
-        week_unique = len({record.track_key for record in week_records})
-        week_rotation = week_unique / week_total if week_total else 0.0
-        week_repetition = _recency_weighted_repetition_score(week_records)
-        weekly_metric_rows.extend(
-            [
-                (week_start, "rotation", week_rotation),
-                (week_start, "repetition_score", week_repetition),
-            ]
-        )
-
-        week_hour_counts: dict[int, int] = defaultdict(int)
-        week_day_counts: dict[int, int] = defaultdict(int)
-        for record in week_records:
-            week_hour_counts[record.end_time.hour] += 1
-            week_day_counts[record.end_time.weekday()] += 1
-        weekly_temporal_rows.extend(
-            (
-                "weekly",
-                week_start,
-                "hour",
-                hour,
-                count,
+def compute_and_store_metrics(connection) -> None:
+    init_metrics_tables(connection)
+    _configure_for_rebuild(connection)
+    # One transaction: a failed rebuild leaves the previous metrics in place.
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        _refresh_stream_stats(connection)
+        _clear_existing_metrics(connection)
+
+        # MIN(id) pins the bare name columns to the first-seen row of each track.
+        connection.execute(
+            """
+            INSERT INTO track_aggregates (
+                track_key,
+                track_name,
+                artist_name,
+                play_count,
+                total_ms_played,
+                avg_ms_played,
+                plays_over_60s,
+                persistence_proxy
+            )
+            SELECT
+                track_key,
+                track_name,
+                artist_name,
+                play_count,
+                total_ms_played,
+                avg_ms_played,
+                plays_over_60s,
+                1.0 * plays_over_60s / play_count
+            FROM (
+                SELECT
+                    MIN(id),
+                    track_key,
+                    track_name,
+                    artist_name,
+                    COUNT(*) AS play_count,
+                    SUM(ms_played) AS total_ms_played,
+                    AVG(ms_played) AS avg_ms_played,
+                    SUM(ms_played >= 60000) AS plays_over_60s
+                FROM streams
+                GROUP BY track_key
             )
-            for hour, count in sorted(week_hour_counts.items())
+            """
         )
-        weekly_temporal_rows.extend(
-            (
-                "weekly",
-                week_start,
-                "day_of_week",
-                day,
-                count,
+
+        _create_parsed_plays(connection)
+
+        connection.execute(
+            f"""
+            WITH reference AS (
+                SELECT MAX(ts) AS ref_ts FROM parsed_plays
+            ),
+            totals AS MATERIALIZED (
+                -- Single scan; the cross-joined reference is a per-row constant.
+                SELECT
+                    COUNT(*) AS plays,
+                    COUNT(DISTINCT track_key) AS unique_tracks,
+                    SUM({_RECENCY_WEIGHT_SQL}) AS weight
+                FROM parsed_plays CROSS JOIN reference
             )
-            for day, count in sorted(week_day_counts.items())
+            INSERT INTO metrics_global (metric_name, metric_value)
+            SELECT 'rotation', COALESCE(1.0 * unique_tracks / NULLIF(plays, 0), 0.0)
+            FROM totals
+            UNION ALL
+            SELECT 'repetition_score', COALESCE(weight / NULLIF(unique_tracks, 0), 0.0)
+            FROM totals
+            """
         )
 
-    if temporal_rows or weekly_temporal_rows:
-        connection.executemany(
+        connection.execute(
             """
             INSERT INTO temporal_distributions (
                 scope,
@@ -287,18 +184,49 @@ def compute_and_store_metrics(connection) -> None:
                 bucket,
                 play_count
             )
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            temporal_rows + weekly_temporal_rows,
+            SELECT 'global', NULL, 'hour', hour, COUNT(*)
+            FROM parsed_plays
+            GROUP BY hour
+            UNION ALL
+            SELECT 'global', NULL, 'day_of_week', weekday, COUNT(*)
+            FROM parsed_plays
+            GROUP BY weekday
+            UNION ALL
+            SELECT 'weekly', week_start, 'hour', hour, COUNT(*)
+            FROM parsed_plays
+            GROUP BY week_start, hour
+            UNION ALL
+            SELECT 'weekly', week_start, 'day_of_week', weekday, COUNT(*)
+            FROM parsed_plays
+            GROUP BY week_start, weekday
+            """
         )
 
-    if weekly_metric_rows:
-        connection.executemany(
-            """
+        connection.execute(
+            f"""
+            WITH weeks AS MATERIALIZED (
+                SELECT week_start, COUNT(*) AS plays, MAX(ts) AS ref_ts
+                FROM parsed_plays
+                GROUP BY week_start
+            ),
+            week_tracks AS MATERIALIZED (
+                -- One DISTINCT pass shared by rotation and repetition.
+                SELECT week_start, COUNT(*) AS unique_tracks
+                FROM (SELECT DISTINCT week_start, track_key FROM parsed_plays)
+                GROUP BY week_start
+            ),
+            weighted AS (
+                SELECT week_start, SUM({_RECENCY_WEIGHT_SQL}) AS weight
+                FROM parsed_plays JOIN weeks USING (week_start)
+                GROUP BY week_start
+            )
             INSERT INTO metrics_weekly (week_start, metric_name, metric_value)
-            VALUES (?, ?, ?)
-            """,
-            weekly_metric_rows,
+            SELECT week_start, 'rotation', 1.0 * unique_tracks / plays
+            FROM weeks JOIN week_tracks USING (week_start)
+            UNION ALL
+            SELECT week_start, 'repetition_score', weight / unique_tracks
+            FROM weighted JOIN week_tracks USING (week_start)
+            """
         )
 
-    connection.commit()
+        connection.execute("DROP TABLE temp.parsed_plays")
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from bisect import bisect_right
+from dataclasses import dataclass
 import json
 import math
 from pathlib import Path
@@ -47,8 +48,19 @@ class MusicalDNA:
     def to_dict(self) -> dict[str, Any]:
         """Return a deterministic dict payload suitable for JSON serialization."""
 
-        payload = asdict(self)
-        return payload
+        # Built by hand: dataclasses.asdict deep-copies every leaf recursively and
+        # cost about as much as the JSON encoding itself.
+        return {
+            "feature_summary": {
+                feature: dict(vars(summary)) for feature, summary in self.feature_summary.items()
+            },
+            "tempo_bands": [dict(band) for band in self.tempo_bands],
+            "energy_dance_matrix": {
+                energy_level: dict(row) for energy_level, row in self.energy_dance_matrix.items()
+            },
+            "taste_axes": dict(self.taste_axes),
+            "track_count": self.track_count,
+        }
 
 
 # Fixed ordering for deterministic JSON payloads.
@@ -60,92 +72,127 @@ _TEMPO_BANDS: tuple[tuple[str, float, float], ...] = (
     ("150-170", 150.0, 170.0),
     (">=170", 170.0, float("inf")),
 )
-
-
-def _is_valid_number(value: Any) -> bool:
-    return isinstance(value, (int, float)) and math.isfinite(float(value))
+# Upper bounds of every band but the last; bisect_right maps a tempo to its band.
+_TEMPO_EDGES: tuple[float, ...] = tuple(high for _, _, high in _TEMPO_BANDS[:-1])
 
 
 def _clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
 
 
-def _quantile(values: list[float], q: float) -> float:
-    if not values:
-        return 0.0
-    ordered = sorted(values)
-    if len(ordered) == 1:
-        return float(ordered[0])
-    position = (len(ordered) - 1) * q
-    lower = math.floor(position)
-    upper = math.ceil(position)
-    if lower == upper:
-        return float(ordered[lower])
-    weight = position - lower
-    return float(ordered[lower] * (1 - weight) + ordered[upper] * weight)
+def _quantiles(ordered: list[float], qs: tuple[float, ...]) -> tuple[float, ...]:
+    """Linearly interpolated quantiles of an already sorted, non-empty list."""
+
+    last = len(ordered) - 1
+    output: list[float] = []
+    for q in qs:
+        position = last * q
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        if lower == upper:
+            output.append(float(ordered[lower]))
+            continue
+        weight = position - lower
+        output.append(float(ordered[lower] * (1 - weight) + ordered[upper] * weight))
+    return tuple(output)
 
 
 def _population_std(values: list[float], mean_value: float) -> float:
     if not values:
         return 0.0
-    variance = sum((item - mean_value) ** 2 for item in values) / len(values)
+    # Squaring by multiplication in a list comprehension is ~1.7x faster than
+    # a generator of ``** 2``; results can differ from pow() in the last bit.
+    variance = sum([(item - mean_value) * (item - mean_value) for item in values]) / len(values)
     return float(math.sqrt(variance))
 
 
-def _normalize_feature_value(feature: str, value: float) -> float:
-    if feature == "tempo":
-        return max(0.0, value)
-    return _clamp(value, 0.0, 1.0)
+def _coerce_feature_value(value: Any, is_tempo: bool) -> float | None:
+    """Validate, convert and normalize one cell with a single float() call."""
+
+    if not isinstance(value, (int, float)):
+        return None
+    number = float(value)
+    if not math.isfinite(number):
+        return None
+    if is_tempo:
+        return max(0.0, number)
+    return _clamp(number, 0.0, 1.0)
+
+
+def _feature_column(tracks: list[Mapping[str, Any]], feature: str) -> list[float | None]:
+    is_tempo = feature == "tempo"
+    isfinite = math.isfinite
+    column: list[float | None] = []
+    append = column.append
+    for track in tracks:
+        value = track.get(feature)
+        # Plain floats are the common case; handle them inline and leave ints,
+        # bools and rejects to the general path.
+        if value.__class__ is not float:
+            append(_coerce_feature_value(value, is_tempo))
+        elif not isfinite(value):
+            append(None)
+        elif is_tempo:
+            append(value if value > 0.0 else 0.0)
+        else:
+            append(0.0 if value <= 0.0 else 1.0 if value > 1.0 else value)
+    return column
 
 
 def _summarize_feature(values: list[float]) -> FeatureSummary:
+    """Summarize ``values``, sorting the list in place once the sums are taken."""
+
     if not values:
         return FeatureSummary(count=0, mean=0.0, std=0.0, min=0.0, max=0.0, p10=0.0, p50=0.0, p90=0.0)
     mean_value = float(sum(values) / len(values))
+    std_value = _population_std(values, mean_value)
+    # One in-place sort serves min, max and all three quantiles without a copy.
+    values.sort()
+    p10, p50, p90 = _quantiles(values, (0.10, 0.50, 0.90))
     return FeatureSummary(
         count=len(values),
         mean=mean_value,
-        std=_population_std(values, mean_value),
-        min=float(min(values)),
-        max=float(max(values)),
-        p10=_quantile(values, 0.10),
-        p50=_quantile(values, 0.50),
-        p90=_quantile(values, 0.90),
+        std=std_value,
+        min=float(values[0]),
+        max=float(values[-1]),
+        p10=p10,
+        p50=p50,
+        p90=p90,
     )
 
 
 def _tempo_histogram(tempo_values: list[float]) -> list[dict[str, float | int | str]]:
     total = len(tempo_values)
+    counts = [0] * len(_TEMPO_BANDS)
+    for value in tempo_values:
+        counts[bisect_right(_TEMPO_EDGES, value)] += 1
     output: list[dict[str, float | int | str]] = []
-    for label, low, high in _TEMPO_BANDS:
-        if math.isinf(low):
-            count = sum(1 for value in tempo_values if value < high)
-        elif math.isinf(high):
-            count = sum(1 for value in tempo_values if value >= low)
-        else:
-            count = sum(1 for value in tempo_values if low <= value < high)
+    for (label, _low, _high), count in zip(_TEMPO_BANDS, counts):
         proportion = (count / total) if total else 0.0
         output.append({"band": label, "count": count, "proportion": proportion})
     return output
 
 
-def _bucket_3(value: float) -> str:
-    if value < 0.33:
-        return "low"
-    if value < 0.66:
-        return "med"
-    return "high"
+_LEVELS: tuple[str, ...] = ("low", "med", "high")
+_LEVEL_EDGES: tuple[float, ...] = (0.33, 0.66)
 
 
-def _energy_dance_matrix(energies: list[float], danceabilities: list[float]) -> dict[str, dict[str, int]]:
-    matrix = {
-        "low": {"low": 0, "med": 0, "high": 0},
-        "med": {"low": 0, "med": 0, "high": 0},
-        "high": {"low": 0, "med": 0, "high": 0},
-    }
+def _energy_dance_matrix(
+    energies: list[float | None], danceabilities: list[float | None]
+) -> dict[str, dict[str, int]]:
+    # Flat 3x3 histogram indexed by energy_level * 3 + dance_level; rows missing
+    # either feature are skipped.
+    counts = [0] * 9
     for energy, danceability in zip(energies, danceabilities):
-        matrix[_bucket_3(energy)][_bucket_3(danceability)] += 1
-    return matrix
+        if energy is None or danceability is None:
+            continue
+        counts[bisect_right(_LEVEL_EDGES, energy) * 3 + bisect_right(_LEVEL_EDGES, danceability)] += 1
+    return {
+        energy_level: {
+            dance_level: counts[row * 3 + column] for column, dance_level in enumerate(_LEVELS)
+        }
+        for row, energy_level in enumerate(_LEVELS)
+    }
 
 
 def _taste_axes(feature_summary: dict[str, FeatureSummary]) -> dict[str, float]:
@@ -178,35 +225,20 @@ def compute_musical_dna(tracks: list[Mapping[str, Any]]) -> MusicalDNA:
     Normalized features are clamped to [0, 1]. Tempo is clamped to >=0.
     """
 
-    values_by_feature: dict[str, list[float]] = {feature: [] for feature in FEATURE_KEYS}
-    paired_energy_dance: list[tuple[float, float]] = []
+    # Column-at-a-time: one normalized column per feature, None where invalid,
+    # so summaries and the energy/dance pairing all read the same cells.
+    columns = {feature: _feature_column(tracks, feature) for feature in FEATURE_KEYS}
 
-    for track in tracks:
-        for feature in FEATURE_KEYS:
-            raw_value = track.get(feature)
-            if not _is_valid_number(raw_value):
-                continue
-            values_by_feature[feature].append(_normalize_feature_value(feature, float(raw_value)))
-
-        energy_raw = track.get("energy")
-        dance_raw = track.get("danceability")
-        if _is_valid_number(energy_raw) and _is_valid_number(dance_raw):
-            paired_energy_dance.append(
-                (
-                    _normalize_feature_value("energy", float(energy_raw)),
-                    _normalize_feature_value("danceability", float(dance_raw)),
-                )
-            )
-
-    summary = {feature: _summarize_feature(values_by_feature[feature]) for feature in FEATURE_KEYS}
-    tempos = values_by_feature["tempo"]
-    energies = [pair[0] for pair in paired_energy_dance]
-    dances = [pair[1] for pair in paired_energy_dance]
+    valid = {
+        feature: [value for value in column if value is not None]
+        for feature, column in columns.items()
+    }
+    summary = {feature: _summarize_feature(valid[feature]) for feature in FEATURE_KEYS}
 
     return MusicalDNA(
         feature_summary=summary,
-        tempo_bands=_tempo_histogram(tempos),
-        energy_dance_matrix=_energy_dance_matrix(energies, dances),
+        tempo_bands=_tempo_histogram(valid["tempo"]),
+        energy_dance_matrix=_energy_dance_matrix(columns["energy"], columns["danceability"]),
         taste_axes=_taste_axes(summary),
         track_count=len(tracks),
     )
@@ -215,15 +247,16 @@ def compute_musical_dna(tracks: list[Mapping[str, Any]]) -> MusicalDNA:
 def load_tracks_from_json(path: Path) -> list[dict[str, Any]]:
     """Load tracks from JSON or NDJSON local artifact."""
 
-    text = path.read_text(encoding="utf-8")
-    stripped = text.strip()
-    if not stripped:
+    # json.loads takes the raw UTF-8 bytes directly, so the file is never
+    # decoded and stripped into extra full-size str copies first.
+    raw = path.read_bytes()
+    if not raw.strip():
         return []
 
     if path.suffix.lower() == ".ndjson":
-        return [json.loads(line) for line in stripped.splitlines() if line.strip()]
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
 
-    payload = json.loads(stripped)
+    payload = json.loads(raw)
     if isinstance(payload, list):
         return [item for item in payload if isinstance(item, dict)]
     if isinstance(payload, dict) and isinstance(payload.get("tracks"), list):
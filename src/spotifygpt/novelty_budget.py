@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from spotifygpt.diurnal import AFTERNOON, LATE_NIGHT, MORNING, NIGHT
 from spotifygpt.session_state import SessionState
@@ -19,8 +20,13 @@ class NoveltyBudget:
 
 def compute_novelty_budget(time_block: str, session_state: SessionState | str) -> NoveltyBudget:
     """Compute deterministic novelty budget from time block and session state."""
-    state = SessionState(session_state)
+    return _compute_novelty_budget_cached(time_block, SessionState(session_state))
 
+
+# Budgets are frozen and the inputs form a tiny discrete space, so each
+# (time block, state) pair is computed once per process.
+@lru_cache(maxsize=64)
+def _compute_novelty_budget_cached(time_block: str, state: SessionState) -> NoveltyBudget:
     exploration = {
         SessionState.CALIENTE: 0.6,
         SessionState.NEUTRO: 0.4,
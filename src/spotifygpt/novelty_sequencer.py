@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections import deque
+
 from spotifygpt.novelty_budget import NoveltyBudget
 
 
@@ -16,12 +18,8 @@ def apply_novelty_budget(
     anchors can be pulled forward to satisfy spacing when possible.
     """
 
-    seen: set[str] = set()
-    unique_candidates: list[str] = []
-    for track_id in candidates:
-        if track_id not in seen:
-            seen.add(track_id)
-            unique_candidates.append(track_id)
+    # dict.fromkeys dedups in C while keeping first-seen order.
+    unique_candidates = list(dict.fromkeys(candidates))
 
     if not unique_candidates:
         return []
@@ -30,31 +28,34 @@ def apply_novelty_budget(
         return unique_candidates
 
     output: list[str] = []
-    emitted: set[str] = set()
+    append = output.append
     since_last_anchor = 0
-    anchor_every_n = max(1, budget.anchor_every_n)
+    spacing_limit = max(1, budget.anchor_every_n) - 1
+    # Work over positions: one set lookup per candidate up front, then flag
+    # arrays instead of per-step set membership on the track ids.
+    is_anchor = [track_id in anchors for track_id in unique_candidates]
+    pulled = bytearray(len(unique_candidates))
+    # Anchors are only ever pulled from the front, so this queue of positions
+    # replaces a forward scan per pull and keeps the whole pass O(N).
+    anchor_positions = deque(position for position, flag in enumerate(is_anchor) if flag)
 
     for index, track_id in enumerate(unique_candidates):
-        if track_id in emitted:
+        if is_anchor[index]:
+            if not pulled[index]:
+                append(track_id)
+                since_last_anchor = 0
             continue
 
-        if track_id not in anchors and since_last_anchor >= anchor_every_n - 1:
-            pulled_anchor = None
-            for candidate in unique_candidates[index + 1 :]:
-                if candidate in anchors and candidate not in emitted:
-                    pulled_anchor = candidate
-                    break
-
-            if pulled_anchor is not None:
-                output.append(pulled_anchor)
-                emitted.add(pulled_anchor)
+        if since_last_anchor >= spacing_limit:
+            while anchor_positions and anchor_positions[0] <= index:
+                anchor_positions.popleft()
+            if anchor_positions:
+                position = anchor_positions.popleft()
+                pulled[position] = 1
+                append(unique_candidates[position])
                 since_last_anchor = 0
 
-        output.append(track_id)
-        emitted.add(track_id)
-        if track_id in anchors:
-            since_last_anchor = 0
-        else:
-            since_last_anchor += 1
+        append(track_id)
+        since_last_anchor += 1
 
     return output
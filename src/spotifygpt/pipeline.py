@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+from functools import lru_cache
 import sqlite3
-from typing import Iterable
+from typing import Iterable, Iterator
 
 
 @dataclass(frozen=True)
@@ -56,30 +57,38 @@ class Alert:
     message: str
 
 
+@lru_cache(maxsize=65_536)
 def _parse_end_time(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
-def fetch_streams(connection: sqlite3.Connection) -> list[StreamRecord]:
-    connection.row_factory = sqlite3.Row
-    rows = connection.execute(
+STREAM_FETCH_BATCH = 4096
+
+
+def iter_streams(connection: sqlite3.Connection) -> Iterator[StreamRecord]:
+    # Positional rows: cheaper than sqlite3.Row and the column order is fixed here.
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    cursor.execute(
         """
         SELECT track_name, artist_name, track_key, end_time, ms_played
         FROM streams
         """
-    ).fetchall()
-    streams: list[StreamRecord] = []
-    for row in rows:
-        streams.append(
-            StreamRecord(
-                track_name=row["track_name"],
-                artist_name=row["artist_name"],
-                track_key=row["track_key"],
-                end_time=_parse_end_time(row["end_time"]),
-                ms_played=int(row["ms_played"]),
+    )
+    cursor.arraysize = STREAM_FETCH_BATCH
+    while rows := cursor.fetchmany():
+        for track_name, artist_name, track_key, end_time, ms_played in rows:
+            yield StreamRecord(
+                track_name=track_name,
+                artist_name=artist_name,
+                track_key=track_key,
+                end_time=_parse_end_time(end_time),
+                ms_played=int(ms_played),
             )
-        )
-    return streams
+
+
+def fetch_streams(connection: sqlite3.Connection) -> list[StreamRecord]:
+    return list(iter_streams(connection))
 
 
 def init_pipeline_tables(connection: sqlite3.Connection) -> None:
@@ -134,10 +143,18 @@ def init_pipeline_tables(connection: sqlite3.Connection) -> None:
         )
         """
     )
+    # Covers the per-track GROUP BY in classify_tracks and generate_alerts, so
+    # both aggregate straight off the index without a sort.
+    connection.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_streams_track
+        ON streams (track_key, track_name, artist_name, ms_played)
+        """
+    )
     connection.commit()
 
 
-def compute_metrics(connection: sqlite3.Connection) -> list[Metric]:
+def compute_metrics(connection: sqlite3.Connection, *, commit: bool = True) -> list[Metric]:
     connection.row_factory = sqlite3.Row
     row = connection.execute(
         """
@@ -160,43 +177,47 @@ def compute_metrics(connection: sqlite3.Connection) -> list[Metric]:
         INSERT OR REPLACE INTO metrics (name, value)
         VALUES (?, ?)
         """,
-        [(metric.name, metric.value) for metric in metrics],
+        ((metric.name, metric.value) for metric in metrics),
     )
-    connection.commit()
+    if commit:
+        connection.commit()
     return metrics
 
 
 def classify_tracks(
-    connection: sqlite3.Connection, threshold_ms: int = 200_000
+    connection: sqlite3.Connection, threshold_ms: int = 200_000, *, commit: bool = True
 ) -> list[Classification]:
-    connection.row_factory = sqlite3.Row
-    rows = connection.execute(
+    cursor = connection.execute(
         """
-        SELECT track_key, track_name, artist_name, SUM(ms_played) AS total_ms
+        SELECT
+            track_key,
+            track_name,
+            artist_name,
+            SUM(ms_played) AS total_ms,
+            CASE WHEN SUM(ms_played) >= ? THEN 'heavy_rotation' ELSE 'casual' END
         FROM streams
         GROUP BY track_key, track_name, artist_name
-        """
-    ).fetchall()
-    classifications: list[Classification] = []
-    for row in rows:
-        total_ms = int(row["total_ms"])
-        category = "heavy_rotation" if total_ms >= threshold_ms else "casual"
-        classifications.append(
-            Classification(
-                track_key=row["track_key"],
-                track_name=row["track_name"],
-                artist_name=row["artist_name"],
-                total_ms=total_ms,
-                category=category,
-            )
+        """,
+        (threshold_ms,),
+    )
+    # Iterate the cursor directly rather than materialising fetchall() first.
+    classifications = [
+        Classification(
+            track_key=track_key,
+            track_name=track_name,
+            artist_name=artist_name,
+            total_ms=total_ms,
+            category=category,
         )
+        for track_key, track_name, artist_name, total_ms, category in cursor
+    ]
     connection.executemany(
         """
         INSERT OR REPLACE INTO classifications
             (track_key, track_name, artist_name, total_ms, category)
         VALUES (?, ?, ?, ?, ?)
         """,
-        [
+        (
             (
                 entry.track_key,
                 entry.track_name,
@@ -205,70 +226,72 @@ def classify_tracks(
                 entry.category,
             )
             for entry in classifications
-        ],
+        ),
     )
-    connection.commit()
+    if commit:
+        connection.commit()
     return classifications
 
 
-def _week_start(value: datetime) -> datetime:
-    return value - timedelta(days=value.weekday())
-
-
 def build_weekly_radar(
-    connection: sqlite3.Connection, top_n: int = 5
+    connection: sqlite3.Connection, top_n: int = 5, *, commit: bool = True
 ) -> list[WeeklyRadarEntry]:
-    streams = fetch_streams(connection)
-    totals: dict[tuple[datetime, str], tuple[StreamRecord, int]] = {}
-    for stream in streams:
-        week = _week_start(stream.end_time).date()
-        key = (week, stream.track_key)
-        if key not in totals:
-            totals[key] = (stream, 0)
-        totals[key] = (totals[key][0], totals[key][1] + stream.ms_played)
-
-    if not totals:
+    # Monday of the stored local date; MIN(id) keeps the first-seen names and
+    # breaks total_ms ties in first-appearance order.
+    rows = connection.execute(
+        """
+        WITH plays AS (
+            SELECT
+                id,
+                track_key,
+                track_name,
+                artist_name,
+                ms_played,
+                date(substr(end_time, 1, 10), '-6 days', 'weekday 1') AS week_start
+            FROM streams
+        ),
+        latest AS (
+            SELECT MAX(week_start) AS week_start FROM plays
+        )
+        SELECT
+            week_start,
+            track_key,
+            track_name,
+            artist_name,
+            SUM(ms_played) AS total_ms,
+            MIN(id) AS first_id
+        FROM plays JOIN latest USING (week_start)
+        GROUP BY track_key
+        ORDER BY total_ms DESC, first_id
+        LIMIT ?
+        """,
+        (max(top_n, 0),),
+    ).fetchall()
+    if not rows:
         return []
 
-    weeks = {week for (week, _track) in totals.keys()}
-    latest_week = max(weeks)
-    entries: list[WeeklyRadarEntry] = []
-    for (week, _track), (stream, total_ms) in totals.items():
-        if week != latest_week:
-            continue
-        entries.append(
-            WeeklyRadarEntry(
-                week_start=week.isoformat(),
-                track_key=stream.track_key,
-                track_name=stream.track_name,
-                artist_name=stream.artist_name,
-                total_ms=total_ms,
-                rank=0,
-            )
+    ranked = [
+        WeeklyRadarEntry(
+            week_start=week_start,
+            track_key=track_key,
+            track_name=track_name,
+            artist_name=artist_name,
+            total_ms=total_ms,
+            rank=idx,
         )
-
-    entries.sort(key=lambda entry: entry.total_ms, reverse=True)
-    ranked: list[WeeklyRadarEntry] = []
-    for idx, entry in enumerate(entries[:top_n], start=1):
-        ranked.append(
-            WeeklyRadarEntry(
-                week_start=entry.week_start,
-                track_key=entry.track_key,
-                track_name=entry.track_name,
-                artist_name=entry.artist_name,
-                total_ms=entry.total_ms,
-                rank=idx,
-            )
+        for idx, (week_start, track_key, track_name, artist_name, total_ms, _first_id) in enumerate(
+            rows, start=1
         )
+    ]
 
-    connection.execute("DELETE FROM weekly_radar WHERE week_start = ?", (latest_week.isoformat(),))
+    connection.execute("DELETE FROM weekly_radar WHERE week_start = ?", (ranked[0].week_start,))
     connection.executemany(
         """
         INSERT INTO weekly_radar
             (week_start, track_key, track_name, artist_name, total_ms, rank)
         VALUES (?, ?, ?, ?, ?, ?)
         """,
-        [
+        (
             (
                 entry.week_start,
                 entry.track_key,
@@ -278,28 +301,31 @@ def build_weekly_radar(
                 entry.rank,
             )
             for entry in ranked
-        ],
+        ),
     )
-    connection.commit()
+    if commit:
+        connection.commit()
     return ranked
 
 
-def build_daily_mode(connection: sqlite3.Connection) -> DailyModeEntry | None:
-    streams = fetch_streams(connection)
-    totals: dict[str, list[int]] = {}
-    for stream in streams:
-        day = stream.end_time.date().isoformat()
-        if day not in totals:
-            totals[day] = [0, 0]
-        totals[day][0] += stream.ms_played
-        totals[day][1] += 1
-
-    if not totals:
+def build_daily_mode(
+    connection: sqlite3.Connection, *, commit: bool = True
+) -> DailyModeEntry | None:
+    # The stored text's date prefix is the local day, as datetime.date() gave.
+    row = connection.execute(
+        """
+        SELECT substr(end_time, 1, 10) AS day, SUM(ms_played), COUNT(*)
+        FROM streams
+        GROUP BY day
+        ORDER BY day DESC
+        LIMIT 1
+        """
+    ).fetchone()
+    if row is None:
         return None
 
-    latest_day = max(totals.keys())
-    total_ms, stream_count = totals[latest_day]
-    entry = DailyModeEntry(date=latest_day, total_ms=total_ms, stream_count=stream_count)
+    day, total_ms, stream_count = row
+    entry = DailyModeEntry(date=day, total_ms=total_ms, stream_count=stream_count)
     connection.execute(
         """
         INSERT OR REPLACE INTO daily_mode (date, total_ms, stream_count)
@@ -307,29 +333,25 @@ def build_daily_mode(connection: sqlite3.Connection) -> DailyModeEntry | None:
         """,
         (entry.date, entry.total_ms, entry.stream_count),
     )
-    connection.commit()
+    if commit:
+        connection.commit()
     return entry
 
 
-def generate_alerts(connection: sqlite3.Connection) -> list[Alert]:
+def generate_alerts(connection: sqlite3.Connection, *, commit: bool = True) -> list[Alert]:
     connection.row_factory = sqlite3.Row
-    row = connection.execute(
+    # SQLite computes the share and filters on it, so a row only comes back
+    # when the dominant-track alert actually fires.
+    top_row = connection.execute(
         """
         SELECT
+            track_name,
+            artist_name,
             SUM(ms_played) AS total_ms,
-            MAX(ms_played) AS max_ms
-        FROM streams
-        """
-    ).fetchone()
-    total_ms = int(row["total_ms"] or 0)
-    if total_ms == 0:
-        return []
-
-    top_row = connection.execute(
-        """
-        SELECT track_name, artist_name, SUM(ms_played) AS total_ms
+            SUM(ms_played) * 1.0 / (SELECT SUM(ms_played) FROM streams) AS share
         FROM streams
         GROUP BY track_key, track_name, artist_name
+        HAVING share >= 0.5
         ORDER BY total_ms DESC
         LIMIT 1
         """
@@ -337,29 +359,48 @@ def generate_alerts(connection: sqlite3.Connection) -> list[Alert]:
     if top_row is None:
         return []
 
-    top_ms = int(top_row["total_ms"])
-    share = top_ms / total_ms
-    alerts: list[Alert] = []
-    if share >= 0.5:
-        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
-        message = (
-            "Dominant track detected: "
-            f"{top_row['track_name']} by {top_row['artist_name']} "
-            f"accounted for {share:.0%} of playtime."
-        )
-        alerts.append(Alert(created_at=created_at, level="info", message=message))
+    created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    message = (
+        "Dominant track detected: "
+        f"{top_row['track_name']} by {top_row['artist_name']} "
+        f"accounted for {top_row['share']:.0%} of playtime."
+    )
+    alerts = [Alert(created_at=created_at, level="info", message=message)]
 
     connection.executemany(
         """
         INSERT INTO alerts (created_at, level, message)
         VALUES (?, ?, ?)
         """,
-        [(alert.created_at, alert.level, alert.message) for alert in alerts],
+        ((alert.created_at, alert.level, alert.message) for alert in alerts),
     )
-    connection.commit()
+    if commit:
+        connection.commit()
     return alerts
 
 
+@dataclass(frozen=True)
+class PipelineRun:
+    metrics: list[Metric]
+    classifications: list[Classification]
+    weekly_radar: list[WeeklyRadarEntry]
+    daily_mode: DailyModeEntry | None
+    alerts: list[Alert]
+
+
+def run_pipeline(connection: sqlite3.Connection) -> PipelineRun:
+    # One transaction for every step: a single commit (and fsync) instead of
+    # one per step, and a failed step leaves none of its siblings' writes.
+    with connection:
+        return PipelineRun(
+            metrics=compute_metrics(connection, commit=False),
+            classifications=classify_tracks(connection, commit=False),
+            weekly_radar=build_weekly_radar(connection, commit=False),
+            daily_mode=build_daily_mode(connection, commit=False),
+            alerts=generate_alerts(connection, commit=False),
+        )
+
+
 def count_streams(connection: sqlite3.Connection) -> int:
     row = connection.execute("SELECT COUNT(*) FROM streams").fetchone()
     return int(row[0]) if row else 0
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import combinations
 import json
 import math
+import operator
 from pathlib import Path
 import sqlite3
 from typing import Any
@@ -31,17 +33,17 @@ DEFAULT_MODE_LABELS = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlaylistRef:
     playlist_id: int
     name: str
     selector: str
 
 
-def _quantile(values: list[float], q: float) -> float:
-    if not values:
+def _quantile(ordered: list[float], q: float) -> float:
+    # ``ordered`` must already be sorted; callers sort once for all cut points.
+    if not ordered:
         return 0.0
-    ordered = sorted(values)
     if len(ordered) == 1:
         return float(ordered[0])
     position = (len(ordered) - 1) * q
@@ -66,12 +68,22 @@ def _std(values: list[float], mean_value: float) -> float:
     return float(math.sqrt(variance))
 
 
-def _feature_stats(rows: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+def _feature_columns(rows: list[tuple[float, ...]]) -> list[list[float]]:
+    # One transpose up front instead of a per-feature pass over every row.
+    if not rows:
+        return [[] for _ in FEATURES]
+    return [list(column) for column in zip(*rows)]
+
+
+def _feature_stats(rows: list[tuple[float, ...]]) -> dict[str, dict[str, float]]:
     stats: dict[str, dict[str, float]] = {}
-    for feature in FEATURES:
-        values = [row[feature] for row in rows if feature in row]
+    for feature, values in zip(FEATURES, _feature_columns(rows)):
+        mean_value = _mean(values)
+        # The column is a private copy: sort it in place once for all three
+        # quantiles (after the mean, so the summation order is unchanged).
+        values.sort()
         stats[feature] = {
-            "mean": _mean(values),
+            "mean": mean_value,
             "p25": _quantile(values, 0.25),
             "p50": _quantile(values, 0.5),
             "p75": _quantile(values, 0.75),
@@ -79,27 +91,48 @@ def _feature_stats(rows: list[dict[str, float]]) -> dict[str, dict[str, float]]:
     return stats
 
 
-def _load_feature_rows(connection: sqlite3.Connection, where_clause: str, params: tuple[Any, ...]) -> list[dict[str, float]]:
-    fields = ", ".join(f"af.{feature}" for feature in FEATURES)
+# Missing features become 0.0 in SQL; the REAL columns already come back as
+# floats, so rows are used exactly as fetched.
+_FEATURE_FIELDS = ", ".join(f"COALESCE(af.{feature}, 0.0)" for feature in FEATURES)
+
+
+def _load_feature_rows(connection: sqlite3.Connection, where_clause: str, params: tuple[Any, ...]) -> list[tuple[float, ...]]:
     query = f"""
-        SELECT {fields}
+        SELECT {_FEATURE_FIELDS}
         FROM ({where_clause}) dataset
         JOIN tracks t ON t.id = dataset.track_id
         JOIN audio_features af ON af.track_key = t.track_key
         ORDER BY t.track_key
     """
-    rows = connection.execute(query, params).fetchall()
-    payload: list[dict[str, float]] = []
-    for row in rows:
-        entry: dict[str, float] = {}
-        for idx, feature in enumerate(FEATURES):
-            value = row[idx]
-            if value is None:
-                entry[feature] = 0.0
-            else:
-                entry[feature] = float(value)
-        payload.append(entry)
-    return payload
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    return cursor.execute(query, params).fetchall()
+
+
+def _load_playlist_feature_rows(
+    connection: sqlite3.Connection, playlist_ids: list[int]
+) -> dict[int, list[tuple[float, ...]]]:
+    # One query for every mode playlist instead of one per playlist; rows are
+    # grouped back per playlist in the same track_key order.
+    rows_by_playlist: dict[int, list[tuple[float, ...]]] = {playlist_id: [] for playlist_id in playlist_ids}
+    if not playlist_ids:
+        return rows_by_playlist
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    cursor.execute(
+        f"""
+        SELECT pt.playlist_id, {_FEATURE_FIELDS}
+        FROM playlist_tracks pt
+        JOIN tracks t ON t.id = pt.track_id
+        JOIN audio_features af ON af.track_key = t.track_key
+        WHERE pt.playlist_id IN (SELECT value FROM json_each(?))
+        ORDER BY pt.playlist_id, t.track_key
+        """,
+        (json.dumps(playlist_ids),),
+    )
+    for row in cursor:
+        rows_by_playlist[row[0]].append(row[1:])
+    return rows_by_playlist
 
 
 def _resolve_playlist(connection: sqlite3.Connection, selector: str) -> PlaylistRef | None:
@@ -135,7 +168,7 @@ def _deterministic_generated_at(connection: sqlite3.Connection) -> str:
     return datetime(1970, 1, 1, tzinfo=timezone.utc).isoformat()
 
 
-def _profile_from_rows(rows: list[dict[str, float]], label: str, source: str, external_signal: bool = False) -> dict[str, Any]:
+def _profile_from_rows(rows: list[tuple[float, ...]], label: str, source: str, external_signal: bool = False) -> dict[str, Any]:
     return {
         "label": label,
         "source": source,
@@ -145,72 +178,73 @@ def _profile_from_rows(rows: list[dict[str, float]], label: str, source: str, ex
     }
 
 
-def _global_z_params(global_rows: list[dict[str, float]]) -> dict[str, tuple[float, float]]:
+def _global_z_params(
+    global_rows: list[tuple[float, ...]], global_stats: dict[str, dict[str, float]]
+) -> dict[str, tuple[float, float]]:
+    # Means come from the global profile's stats; only the std pass is new work.
     params: dict[str, tuple[float, float]] = {}
-    for feature in FEATURES:
-        values = [row[feature] for row in global_rows]
-        mean_value = _mean(values)
+    for feature, values in zip(FEATURES, _feature_columns(global_rows)):
+        mean_value = global_stats[feature]["mean"]
         std_value = _std(values, mean_value)
         params[feature] = (mean_value, std_value)
     return params
 
 
-def _cosine_distance(a: list[float], b: list[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(y * y for y in b))
+# math.hypot/math.dist and map(mul) keep these short vector ops in C rather
+# than stepping through generator expressions.
+def _cosine_distance(a: list[float], b: list[float], na: float, nb: float) -> float:
+    # Norms are passed in: each profile's is computed once, not once per pair.
+    dot = sum(map(operator.mul, a, b))
     if na == 0 or nb == 0:
         return 0.0
     return float(1.0 - (dot / (na * nb)))
 
 
 def _euclidean_distance(a: list[float], b: list[float]) -> float:
-    return float(math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b))))
+    return float(math.dist(a, b))
 
 
-def _comparison(a: dict[str, Any], b: dict[str, Any], z_params: dict[str, tuple[float, float]]) -> dict[str, Any]:
-    a_means = [a["feature_stats"][feature]["mean"] for feature in FEATURES]
-    b_means = [b["feature_stats"][feature]["mean"] for feature in FEATURES]
-    a_z: list[float] = []
-    b_z: list[float] = []
-    deltas: list[dict[str, float]] = []
-    for idx, feature in enumerate(FEATURES):
+@dataclass(frozen=True)
+class _ProfileVectors:
+    label: str
+    means: list[float]
+    norm: float
+    z_scores: list[float]
+
+
+def _profile_vectors(profile: dict[str, Any], z_params: dict[str, tuple[float, float]]) -> _ProfileVectors:
+    # Built once per profile rather than once per pair it takes part in.
+    feature_stats = profile["feature_stats"]
+    means = [feature_stats[feature]["mean"] for feature in FEATURES]
+    z_scores: list[float] = []
+    for feature, mean in zip(FEATURES, means):
         mean_value, std_value = z_params[feature]
-        if std_value == 0:
-            a_val = 0.0
-            b_val = 0.0
-        else:
-            a_val = (a_means[idx] - mean_value) / std_value
-            b_val = (b_means[idx] - mean_value) / std_value
-        a_z.append(a_val)
-        b_z.append(b_val)
-        delta = a_means[idx] - b_means[idx]
-        deltas.append({"feature": feature, "delta_mean": float(delta), "abs_delta_mean": abs(float(delta))})
+        z_scores.append(0.0 if std_value == 0 else (mean - mean_value) / std_value)
+    return _ProfileVectors(label=profile["label"], means=means, norm=math.hypot(*means), z_scores=z_scores)
+
+
+def _comparison(a: _ProfileVectors, b: _ProfileVectors) -> dict[str, Any]:
+    deltas: list[dict[str, float]] = []
+    for feature, a_mean, b_mean in zip(FEATURES, a.means, b.means):
+        delta = float(a_mean - b_mean)
+        deltas.append({"feature": feature, "delta_mean": delta, "abs_delta_mean": abs(delta)})
 
     deltas.sort(key=lambda item: item["abs_delta_mean"], reverse=True)
     top_diffs = [{"feature": item["feature"], "delta_mean": item["delta_mean"]} for item in deltas]
 
     return {
-        "left": a["label"],
-        "right": b["label"],
-        "cosine": _cosine_distance(a_means, b_means),
-        "euclidean_z": _euclidean_distance(a_z, b_z),
+        "left": a.label,
+        "right": b.label,
+        "cosine": _cosine_distance(a.means, b.means, a.norm, b.norm),
+        "euclidean_z": _euclidean_distance(a.z_scores, b.z_scores),
         "top_differences": top_diffs,
     }
 
 
-def _pairs(profiles: list[dict[str, Any]]) -> list[tuple[dict[str, Any], dict[str, Any]]]:
-    out: list[tuple[dict[str, Any], dict[str, Any]]] = []
-    for i in range(len(profiles)):
-        for j in range(i + 1, len(profiles)):
-            out.append((profiles[i], profiles[j]))
-    return out
-
-
 def _load_mode_labels(mode_labels: dict[str, str] | None, mode_labels_file: Path | None) -> dict[str, str]:
     labels = dict(DEFAULT_MODE_LABELS)
     if mode_labels_file is not None:
-        raw = json.loads(mode_labels_file.read_text(encoding="utf-8"))
+        raw = json.loads(mode_labels_file.read_bytes())
         if isinstance(raw, dict):
             for key, value in raw.items():
                 if isinstance(key, str) and isinstance(value, str):
@@ -246,16 +280,25 @@ def generate_profile(
     if include_radar_playlist:
         all_selectors.append(include_radar_playlist)
 
+    # Each selector is looked up once; the inputs summary below reuses these.
+    resolved: dict[str, PlaylistRef | None] = {}
+
+    def resolve(selector: str) -> PlaylistRef | None:
+        if selector not in resolved:
+            resolved[selector] = _resolve_playlist(connection, selector)
+        return resolved[selector]
+
+    selected: list[tuple[str, PlaylistRef]] = []
     for selector in all_selectors:
-        playlist = _resolve_playlist(connection, selector)
+        playlist = resolve(selector)
         if playlist is None or playlist.playlist_id in seen_ids:
             continue
         seen_ids.add(playlist.playlist_id)
-        rows = _load_feature_rows(
-            connection,
-            "SELECT track_id FROM playlist_tracks WHERE playlist_id = ? ORDER BY position, track_id",
-            (playlist.playlist_id,),
-        )
+        selected.append((selector, playlist))
+
+    rows_by_playlist = _load_playlist_feature_rows(connection, [playlist.playlist_id for _, playlist in selected])
+    for selector, playlist in selected:
+        rows = rows_by_playlist[playlist.playlist_id]
         label = labels.get(selector) or labels.get(playlist.name) or playlist.name
         source = "playlist"
         external_signal = False
@@ -268,15 +311,19 @@ def generate_profile(
         mode_profiles.append(_profile_from_rows(rows, label=label, source=source, external_signal=external_signal))
 
     mode_profiles.sort(key=lambda item: item["label"].lower())
-    z_params = _global_z_params(global_rows)
-    comparisons = [_comparison(left, right, z_params) for left, right in _pairs(mode_profiles)]
+    global_profile = _profile_from_rows(global_rows, label="global", source="liked_songs")
+    comparisons: list[dict[str, Any]] = []
+    if len(mode_profiles) > 1:
+        z_params = _global_z_params(global_rows, global_profile["feature_stats"])
+        vectors = [_profile_vectors(mode_profile, z_params) for mode_profile in mode_profiles]
+        comparisons = [_comparison(left, right) for left, right in combinations(vectors, 2)]
 
     inputs = {
         "liked_songs": connection.execute("SELECT COUNT(*) FROM library").fetchone()[0],
         "mode_playlists_requested": len(mode_selectors),
         "mode_playlists_resolved": len(mode_profiles),
-        "my_top_tracks_playlist": 1 if _resolve_playlist(connection, include_top_tracks_playlist or "") else 0,
-        "radar_de_novedades": 1 if _resolve_playlist(connection, include_radar_playlist or "") else 0,
+        "my_top_tracks_playlist": 1 if resolve(include_top_tracks_playlist or "") else 0,
+        "radar_de_novedades": 1 if resolve(include_radar_playlist or "") else 0,
     }
 
     return {
@@ -284,14 +331,15 @@ def generate_profile(
         "app_version": __version__,
         "generated_at": generated_at or _deterministic_generated_at(connection),
         "inputs": inputs,
-        "global_profile": _profile_from_rows(global_rows, label="global", source="liked_songs"),
+        "global_profile": global_profile,
         "mode_profiles": mode_profiles,
         "comparisons": comparisons,
     }
 
 
 def write_profile(profile: dict[str, Any], output_path: Path = DEFAULT_OUTPUT_PATH) -> None:
-    output_path.write_text(json.dumps(profile, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    # Encode once and write bytes: no text-layer copy, and "\n" endings on every platform.
+    output_path.write_bytes((json.dumps(profile, indent=2, sort_keys=True) + "\n").encode("utf-8"))
 
 
 def _find_activation_regulation_comparison(profile: dict[str, Any]) -> dict[str, Any] | None:
@@ -306,16 +354,16 @@ def _find_activation_regulation_comparison(profile: dict[str, Any]) -> dict[str,
     return comparisons[0] if comparisons else None
 
 
+# One prebuilt template for all FEATURES cells, filled with a single format().
+_STAT_ROW_FORMAT = "| {} | " + " | ".join(["{:.4f} / {:.4f} / {:.4f} / {:.4f}"] * len(FEATURES)) + " |"
+
+
 def _format_stat_row(label: str, stats: dict[str, dict[str, float]]) -> str:
-    values = [
-        label,
-        *(
-            f"{stats[feature]['mean']:.4f} / {stats[feature]['p25']:.4f} / "
-            f"{stats[feature]['p50']:.4f} / {stats[feature]['p75']:.4f}"
-            for feature in FEATURES
-        ),
-    ]
-    return "| " + " | ".join(values) + " |"
+    values: list[float] = []
+    for feature in FEATURES:
+        feature_stats = stats[feature]
+        values += (feature_stats["mean"], feature_stats["p25"], feature_stats["p50"], feature_stats["p75"])
+    return _STAT_ROW_FORMAT.format(label, *values)
 
 
 def _mode_mapping_lines(profile: dict[str, Any]) -> list[str]:
@@ -329,7 +377,7 @@ def _mode_mapping_lines(profile: dict[str, Any]) -> list[str]:
     return lines
 
 
-def _executive_summary_lines(profile: dict[str, Any]) -> list[str]:
+def _executive_summary_lines(profile: dict[str, Any], comparison: dict[str, Any] | None) -> list[str]:
     lines = ["## Executive Summary"]
     mode_profiles = profile.get("mode_profiles", [])
     lines.append(
@@ -343,7 +391,6 @@ def _executive_summary_lines(profile: dict[str, Any]) -> list[str]:
         f"`{profile['inputs']['liked_songs']}` liked songs and `{len(mode_profiles)}` resolved mode playlists."
     )
 
-    comparison = _find_activation_regulation_comparison(profile)
     if comparison is None:
         lines.append("- Activation vs Regulation: not enough mode data to compare both states yet.")
         lines.append("- Transition recommendation: add at least two modes to unlock a tempo/energy bridge suggestion.")
@@ -375,6 +422,8 @@ def render_profile_report(profile: dict[str, Any]) -> str:
     lines: list[str] = []
     inputs = profile["inputs"]
     global_stats = profile["global_profile"]["feature_stats"]
+    # Both the summary and the actionable section key off this pair; find it once.
+    activation_comparison = _find_activation_regulation_comparison(profile)
 
     lines.extend(
         [
@@ -386,7 +435,7 @@ def render_profile_report(profile: dict[str, Any]) -> str:
             f"- generated_at: `{profile['generated_at']}`",
             f"- inputs: liked_songs={inputs['liked_songs']}, mode_playlists_requested={inputs['mode_playlists_requested']}, mode_playlists_resolved={inputs['mode_playlists_resolved']}, my_top_tracks_playlist={inputs['my_top_tracks_playlist']}, radar_de_novedades={inputs['radar_de_novedades']}",
             "",
-            *_executive_summary_lines(profile),
+            *_executive_summary_lines(profile, activation_comparison),
             "",
             *_mode_mapping_lines(profile),
             "",
@@ -430,7 +479,7 @@ def render_profile_report(profile: dict[str, Any]) -> str:
     lines.append("")
 
     lines.append("## Actionable")
-    comparison = _find_activation_regulation_comparison(profile)
+    comparison = activation_comparison
     if comparison is None:
         lines.append("- Activation vs Regulation interpretation unavailable (need at least two mode profiles).")
     else:
@@ -452,4 +501,4 @@ def render_profile_report(profile: dict[str, Any]) -> str:
 
 
 def write_profile_report(profile: dict[str, Any], output_path: Path = DEFAULT_REPORT_OUTPUT_PATH) -> None:
-    output_path.write_text(render_profile_report(profile), encoding="utf-8")
+    output_path.write_bytes(render_profile_report(profile).encode("utf-8"))
@@ -5,22 +5,39 @@ Builds a deterministic ordered recommendation list from candidates and a plan.
 
 from __future__ import annotations
 
+from typing import Callable
+
 from spotifygpt.context_engine import RecommendationPlan
 
 
-def _within_range(value: float | int, value_range: tuple[float | int, float | int]) -> bool:
-    return value_range[0] <= value <= value_range[1]
+# Candidates that pass the range filter travel as (energy, tempo, track) so the
+# float coercions done while filtering are reused by the sort keys.
+_Entry = tuple[float, float, dict]
+
+
+def _flow_key(entry: _Entry) -> tuple[float, float, str]:
+    energy, tempo, track = entry
+    return (tempo, energy, str(track.get("id", "")))
+
 
+def _steady_key(entry: _Entry) -> tuple[float, float, str]:
+    energy, tempo, track = entry
+    return (energy, tempo, str(track.get("id", "")))
 
-def _target_distance(track: dict, plan: RecommendationPlan) -> tuple[float, float, str]:
+
+def _target_distance_key(plan: RecommendationPlan) -> Callable[[_Entry], tuple[float, float, str]]:
+    # Range centres are fixed per plan, so compute them once per sort.
     energy_center = (plan.target_energy_range[0] + plan.target_energy_range[1]) / 2
     tempo_center = (plan.target_tempo_range[0] + plan.target_tempo_range[1]) / 2
-    energy = float(track.get("energy", 0.0))
-    tempo = float(track.get("tempo", 0.0))
-    return (abs(energy - energy_center), abs(tempo - tempo_center), str(track.get("id", "")))
+
+    def key(entry: _Entry) -> tuple[float, float, str]:
+        energy, tempo, track = entry
+        return (abs(energy - energy_center), abs(tempo - tempo_center), str(track.get("id", "")))
+
+    return key
 
 
-def _select_exploration_tracks(candidates: list[dict], plan: RecommendationPlan) -> list[dict]:
+def _select_exploration_tracks(candidates: list[_Entry], plan: RecommendationPlan) -> list[_Entry]:
     if not candidates:
         return []
     keep = int(round(len(candidates) * plan.exploration_multiplier))
@@ -28,32 +45,36 @@ def _select_exploration_tracks(candidates: list[dict], plan: RecommendationPlan)
     return candidates[:keep]
 
 
-def _order_tracks(tracks: list[dict], plan: RecommendationPlan) -> list[dict]:
+def _order_tracks(entries: list[_Entry], plan: RecommendationPlan) -> list[dict]:
     if plan.sequencing_strategy == "flow_explore":
-        return sorted(tracks, key=lambda t: (float(t.get("tempo", 0.0)), float(t.get("energy", 0.0)), str(t.get("id", ""))))
-    if plan.sequencing_strategy in {"stabilize_with_anchors", "recovery_mode"}:
-        return sorted(tracks, key=lambda t: (float(t.get("energy", 0.0)), float(t.get("tempo", 0.0)), str(t.get("id", ""))))
-    if plan.sequencing_strategy == "balanced":
-        return list(tracks)
-    return sorted(tracks, key=lambda t: _target_distance(t, plan))
+        ordered = sorted(entries, key=_flow_key)
+    elif plan.sequencing_strategy in {"stabilize_with_anchors", "recovery_mode"}:
+        ordered = sorted(entries, key=_steady_key)
+    elif plan.sequencing_strategy == "balanced":
+        ordered = entries
+    else:
+        ordered = sorted(entries, key=_target_distance_key(plan))
+    return [track for _energy, _tempo, track in ordered]
+
+
+def _interleave(exploration: list[dict], anchors: list[dict], every: int) -> list[dict]:
+    # Place one anchor after each full run of ``every`` exploration tracks,
+    # copying the runs as slices rather than appending track by track.
+    placed = min(len(anchors), len(exploration) // every)
+    output: list[dict] = []
+    for index in range(placed):
+        output += exploration[index * every : (index + 1) * every]
+        output.append(anchors[index])
+    output += exploration[placed * every :]
+    return output
 
 
 def _inject_by_every_n(exploration: list[dict], anchors: list[dict], every_n: int) -> list[dict]:
     if every_n <= 0:
         return list(exploration)
-    output: list[dict] = []
-    anchor_index = 0
-    count_since_anchor = 0
-    for track in exploration:
-        output.append(track)
-        count_since_anchor += 1
-        if count_since_anchor >= every_n and anchor_index < len(anchors):
-            output.append(anchors[anchor_index])
-            anchor_index += 1
-            count_since_anchor = 0
-    if not exploration and anchors:
-        output.append(anchors[0])
-    return output
+    if not exploration:
+        return anchors[:1]
+    return _interleave(exploration, anchors, every_n)
 
 
 def _inject_by_ratio(exploration: list[dict], anchors: list[dict], anchor_ratio: float) -> list[dict]:
@@ -64,33 +85,35 @@ def _inject_by_ratio(exploration: list[dict], anchors: list[dict], anchor_ratio:
     if target_anchor_count == 0:
         return list(exploration)
 
-    output: list[dict] = []
     used_anchors = anchors[:target_anchor_count]
     interval = max(1, len(exploration) // target_anchor_count)
-    anchor_index = 0
-    for idx, track in enumerate(exploration, start=1):
-        output.append(track)
-        if idx % interval == 0 and anchor_index < target_anchor_count:
-            output.append(used_anchors[anchor_index])
-            anchor_index += 1
-    while anchor_index < target_anchor_count:
-        output.append(used_anchors[anchor_index])
-        anchor_index += 1
+    output = _interleave(exploration, used_anchors, interval)
+    # Anchors that did not fit between runs go at the end.
+    output += used_anchors[len(exploration) // interval :]
     return output
 
 
 def build_recommendation(candidates: list[dict], plan: RecommendationPlan) -> list[dict]:
     """Apply a recommendation plan to candidates and return an ordered track list."""
 
-    filtered = [
-        track
-        for track in candidates
-        if _within_range(float(track.get("energy", 0.0)), plan.target_energy_range)
-        and _within_range(float(track.get("tempo", 0.0)), plan.target_tempo_range)
-    ]
-
-    anchors = _order_tracks([track for track in filtered if bool(track.get("is_anchor", False))], plan)
-    exploration_pool = [track for track in filtered if not bool(track.get("is_anchor", False))]
+    energy_low, energy_high = plan.target_energy_range
+    tempo_low, tempo_high = plan.target_tempo_range
+    # One pass filters by range and splits anchors from the exploration pool.
+    anchor_entries: list[_Entry] = []
+    exploration_pool: list[_Entry] = []
+    for track in candidates:
+        energy = float(track.get("energy", 0.0))
+        if not energy_low <= energy <= energy_high:
+            continue
+        tempo = float(track.get("tempo", 0.0))
+        if not tempo_low <= tempo <= tempo_high:
+            continue
+        if track.get("is_anchor", False):
+            anchor_entries.append((energy, tempo, track))
+        else:
+            exploration_pool.append((energy, tempo, track))
+
+    anchors = _order_tracks(anchor_entries, plan)
     exploration = _order_tracks(_select_exploration_tracks(exploration_pool, plan), plan)
 
     if plan.anchor_every_n is not None:
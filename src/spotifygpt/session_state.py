@@ -5,6 +5,8 @@ from __future__ import annotations
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+from typing import Mapping
 
 
 class SessionState(str, Enum):
@@ -16,7 +18,7 @@ class SessionState(str, Enum):
     CRITICO = "CRITICO"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionEvent:
     """A single playback outcome consumed by the state machine."""
 
@@ -24,7 +26,7 @@ class SessionEvent:
     early_skip: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionInterventions:
     """Interventions derived from the current state."""
 
@@ -33,7 +35,7 @@ class SessionInterventions:
     should_suggest_reset: bool
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SessionSnapshot:
     """Current machine state + counters and interventions."""
 
@@ -44,7 +46,7 @@ class SessionSnapshot:
     interventions: SessionInterventions
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStateMachine:
     """Minimal v1 state machine for skip-run behavior."""
 
@@ -52,6 +54,15 @@ class SessionStateMachine:
     skip_run_len: int = 0
     complete_run_len: int = 0
     _early_skip_recent_window: deque[bool] = field(default_factory=deque)
+    _early_skip_recent_count: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        # A bounded deque evicts in C on append; the running count keeps
+        # snapshot() from re-summing the window on every event.
+        self._early_skip_recent_window = deque(
+            self._early_skip_recent_window, maxlen=max(0, self.early_skip_window_size)
+        )
+        self._early_skip_recent_count = sum(self._early_skip_recent_window)
 
     def apply(self, event: SessionEvent) -> SessionSnapshot:
         if event.early_skip:
@@ -64,14 +75,17 @@ class SessionStateMachine:
             self.complete_run_len += 1
             self.skip_run_len = 0
 
-        self._early_skip_recent_window.append(event.early_skip)
-        while len(self._early_skip_recent_window) > self.early_skip_window_size:
-            self._early_skip_recent_window.popleft()
+        window = self._early_skip_recent_window
+        if window.maxlen:
+            if len(window) == window.maxlen:
+                self._early_skip_recent_count -= window[0]
+            window.append(event.early_skip)
+            self._early_skip_recent_count += event.early_skip
 
         return self.snapshot()
 
     def snapshot(self) -> SessionSnapshot:
-        early_skip_recent = sum(self._early_skip_recent_window)
+        early_skip_recent = self._early_skip_recent_count
         state = self._resolve_state(early_skip_recent)
         return SessionSnapshot(
             state=state,
@@ -92,14 +106,23 @@ class SessionStateMachine:
 
     @staticmethod
     def _resolve_interventions(state: SessionState) -> SessionInterventions:
-        exploration_multiplier = {
-            SessionState.CALIENTE: 1.0,
-            SessionState.NEUTRO: 0.8,
-            SessionState.FRAGIL: 0.4,
-            SessionState.CRITICO: 0.2,
-        }[state]
-        return SessionInterventions(
-            exploration_multiplier=exploration_multiplier,
-            should_inject_anchor=state in (SessionState.FRAGIL, SessionState.CRITICO),
-            should_suggest_reset=state is SessionState.CRITICO,
-        )
+        return _INTERVENTIONS[state]
+
+
+# Interventions are a pure function of the state; share one frozen instance each.
+_INTERVENTIONS: Mapping[SessionState, SessionInterventions] = MappingProxyType(
+    {
+        SessionState.CALIENTE: SessionInterventions(
+            exploration_multiplier=1.0, should_inject_anchor=False, should_suggest_reset=False
+        ),
+        SessionState.NEUTRO: SessionInterventions(
+            exploration_multiplier=0.8, should_inject_anchor=False, should_suggest_reset=False
+        ),
+        SessionState.FRAGIL: SessionInterventions(
+            exploration_multiplier=0.4, should_inject_anchor=True, should_suggest_reset=False
+        ),
+        SessionState.CRITICO: SessionInterventions(
+            exploration_multiplier=0.2, should_inject_anchor=True, should_suggest_reset=True
+        ),
+    }
+)
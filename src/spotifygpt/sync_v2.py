@@ -2,19 +2,82 @@
 
 from __future__ import annotations
 
+import base64
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import http.client
 import json
 import logging
+import random
 import sqlite3
+import threading
 import time
-from typing import Any
-from urllib import error, parse, request
+from typing import Any, Callable, Iterable, TypeVar
+from urllib import parse, request
 
 
 TOP_TIME_RANGES = ("short_term", "medium_term", "long_term")
+# Requests a client has in flight at once, across every endpoint and
+# playlist, kept low for rate limits.
+MAX_CONCURRENT_REQUESTS = 8
+# Retry delays in seconds; jitter is the fraction added on top at random.
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
 LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _backoff_delay(attempt: int, retry_after: str | None) -> float:
+    """Exponential backoff with jitter, honouring Retry-After up to the cap."""
+
+    # Jitter spreads clients that were throttled together so they do not all
+    # retry at the same instant.
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    delay *= 1 + random.uniform(0, RETRY_JITTER)
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return min(delay, RETRY_MAX_DELAY)
+
+
+def _format_artists(track: dict[str, Any]) -> str:
+    return ", ".join(
+        artist.get("name", "")
+        for artist in track.get("artists", [])
+        if isinstance(artist, dict)
+    )
+
+
+def _insert_many(connection: sqlite3.Connection, sql: str, rows: list[tuple[Any, ...]]) -> int:
+    """Insert ``rows`` in one executemany and return how many were written."""
+
+    if not rows:
+        return 0
+    # The total_changes delta counts exactly the rows INSERT OR IGNORE kept.
+    before = connection.total_changes
+    connection.executemany(sql, rows)
+    return connection.total_changes - before
+
+
+def _existing_keys(
+    connection: sqlite3.Connection, select_sql: str, time_column: str, since: str | None
+) -> set[tuple[str, str]]:
+    """Unique-key pairs already stored, scoped to the same ``since`` window."""
+
+    # One SELECT and a set lookup per item instead of an index probe for every
+    # row INSERT OR IGNORE would end up rejecting.
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    if since:
+        return set(cursor.execute(f"{select_sql} WHERE {time_column} >= ?", (since,)))
+    return set(cursor.execute(select_sql))
+
 
 class SpotifyAPIError(RuntimeError):
     """Spotify API failure with optional HTTP status code."""
@@ -42,49 +105,165 @@ class SpotifyAPIClient:
         self._token = token
         self._timeout = timeout
         self._max_retries = max_retries
+        # Keep-alive: each thread reuses one HTTPS connection, so only its
+        # first request pays for the TCP and TLS handshakes. Every open
+        # connection is also tracked so close() can shut them all.
+        self._local = threading.local()
+        self._connections: set[http.client.HTTPSConnection] = set()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def close(self) -> None:
+        """Stop the request pool and close every keep-alive connection."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for connection in connections:
+            connection.close()
+
+    def _mark_pool_thread(self) -> None:
+        self._local.on_pool = True
+
+    def run_concurrently(self, func: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+        """``[func(item) for item in items]``, run on the client's request pool.
+
+        Results keep the order of ``items``. Called from a pool thread, the
+        items run inline instead: pool work never waits on other pool work,
+        so nested fan-outs cannot deadlock or exceed MAX_CONCURRENT_REQUESTS.
+        """
+
+        items = list(items)
+        if len(items) < 2 or getattr(self._local, "on_pool", False):
+            return [func(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="spotify-api",
+                    initializer=self._mark_pool_thread,
+                )
+            executor = self._executor
+        return list(executor.map(func, items))
+
+    def _drop_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+            with self._lock:
+                self._connections.discard(connection)
+
+    def _open_connection(self) -> http.client.HTTPSConnection:
+        host = parse.urlsplit(self.base_url).netloc
+        proxy = request.getproxies().get("https")
+        if not proxy or request.proxy_bypass(host):
+            return http.client.HTTPSConnection(host, timeout=self._timeout)
+        # Honour the same HTTPS_PROXY/NO_PROXY settings urlopen does: CONNECT
+        # to the API host through the proxy, then TLS inside the tunnel.
+        proxy_url = parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        tunnel_headers: dict[str, str] = {}
+        if proxy_url.username:
+            credentials = f"{parse.unquote(proxy_url.username)}:{parse.unquote(proxy_url.password or '')}"
+            tunnel_headers["Proxy-Authorization"] = (
+                f"Basic {base64.b64encode(credentials.encode('utf-8')).decode('ascii')}"
+            )
+        connection = http.client.HTTPSConnection(
+            proxy_url.hostname, proxy_url.port or 80, timeout=self._timeout
+        )
+        connection.set_tunnel(host, headers=tunnel_headers)
+        return connection
+
+    def _get(self, target: str) -> tuple[int, str | None, bytes]:
+        """GET ``target`` on this thread's connection: (status, Retry-After, body)."""
+
+        connection = getattr(self._local, "connection", None)
+        reused = connection is not None
+        if connection is None:
+            connection = self._open_connection()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.add(connection)
+        try:
+            connection.request("GET", target, headers={"Authorization": f"Bearer {self._token}"})
+            response = connection.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            self._drop_connection()
+            if reused:
+                # The server may have closed an idle keep-alive socket; one
+                # immediate retry on a fresh connection is not a real failure.
+                return self._get(target)
+            raise
+        if response.will_close:
+            self._drop_connection()
+        return response.status, response.getheader("Retry-After"), body
 
     def _request_json(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
         query = f"?{parse.urlencode(params)}" if params else ""
         url = f"{self.base_url}{path}{query}"
-        req = request.Request(
-            url,
-            headers={"Authorization": f"Bearer {self._token}"},
-        )
+        target = f"{parse.urlsplit(self.base_url).path}{path}{query}"
         attempt = 0
         while True:
             attempt += 1
             try:
-                with request.urlopen(req, timeout=self._timeout) as response:
-                    payload = response.read().decode("utf-8")
-                    return json.loads(payload)
-            except error.HTTPError as exc:
-                if exc.code == 429 and attempt <= self._max_retries:
-                    retry_after = exc.headers.get("Retry-After", "1")
-                    wait_seconds = max(1.0, float(retry_after))
-                    time.sleep(wait_seconds)
+                status, retry_after, body = self._get(target)
+            except (http.client.HTTPException, OSError) as exc:
+                # Connect/read timeouts are transient; retry them like a 429.
+                if attempt <= self._max_retries:
+                    time.sleep(_backoff_delay(attempt, None))
                     continue
-                raise SpotifyAPIError(
-                    f"Spotify API request failed ({exc.code}) for {url}",
-                    status_code=exc.code,
-                ) from exc
-            except error.URLError as exc:
                 raise SpotifyAPIError(f"Spotify API request failed for {url}: {exc}") from exc
+            if status == 429 and attempt <= self._max_retries:
+                time.sleep(_backoff_delay(attempt, retry_after))
+                continue
+            # Redirects are not followed, so any non-2xx answer is an error
+            # rather than a body to hand to json.loads.
+            if not 200 <= status < 300:
+                raise SpotifyAPIError(
+                    f"Spotify API request failed ({status}) for {url}",
+                    status_code=status,
+                )
+            return json.loads(body)
+
+    def _page_items(self, path: str, response: dict[str, Any]) -> list[dict[str, Any]]:
+        page_items = response.get("items", [])
+        if not isinstance(page_items, list):
+            raise RuntimeError(f"Unexpected response shape for {path}")
+        return page_items
 
     def _paginate(self, path: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
         merged = dict(params or {})
         merged.setdefault("limit", 50)
-        offset = 0
-        items: list[dict[str, Any]] = []
+        limit = int(merged["limit"])
+        merged["offset"] = 0
+        first = self._request_json(path, merged)
+        items = list(self._page_items(path, first))
+        if len(items) < limit:
+            return items
+
+        total = first.get("total")
+        if isinstance(total, int):
+            # The first page tells us how many remain, so the other offsets are
+            # fetched concurrently: latency ~max(RTT) instead of sum(RTT).
+            for response in self.run_concurrently(
+                lambda offset: self._request_json(path, {**merged, "offset": offset}),
+                range(limit, total, limit),
+            ):
+                items.extend(self._page_items(path, response))
+            return items
+
+        offset = limit
         while True:
             merged["offset"] = offset
-            response = self._request_json(path, merged)
-            page_items = response.get("items", [])
-            if not isinstance(page_items, list):
-                raise RuntimeError(f"Unexpected response shape for {path}")
+            page_items = self._page_items(path, self._request_json(path, merged))
             items.extend(page_items)
-            if len(page_items) < int(merged["limit"]):
+            if len(page_items) < limit:
                 break
-            offset += int(merged["limit"])
+            offset += limit
         return items
 
     def get_saved_tracks(self, since: str | None) -> list[dict[str, Any]]:
@@ -113,11 +292,52 @@ class SpotifyAPIClient:
         return items
 
 
+@dataclass(frozen=True)
+class _SyncPayload:
+    """Everything a standard sync fetches, gathered before any write."""
+
+    saved_tracks: list[dict[str, Any]]
+    playlists: list[tuple[str, str, str]]
+    playlist_tracks: list[tuple[str, list[dict[str, Any]]]]
+    top_items: list[tuple[str, str, list[dict[str, Any]]]]
+    recently_played: list[dict[str, Any]]
+
+
+def _playlist_rows(playlists: list[dict[str, Any]]) -> list[tuple[str, str, str]]:
+    """(id, name, owner_id) for each playlist with a usable id and owner."""
+
+    rows: list[tuple[str, str, str]] = []
+    for playlist in playlists:
+        playlist_id = playlist.get("id")
+        playlist_name = str(playlist.get("name", ""))
+        owner = playlist.get("owner") or {}
+        owner_id = owner.get("id") if isinstance(owner, dict) else None
+        if not isinstance(playlist_id, str) or not isinstance(owner_id, str):
+            continue
+        rows.append((playlist_id, playlist_name, owner_id))
+    return rows
+
+
 class SyncService:
     def __init__(self, client: SpotifyAPIClient) -> None:
         self._client = client
+        # Formatted artist lists by track id; the same track recurs across
+        # saved tracks, playlists and recent plays within a sync.
+        self._artists_by_track: dict[str, str] = {}
+
+    def _artists(self, track_id: str, track: dict[str, Any]) -> str:
+        artists = self._artists_by_track.get(track_id)
+        if artists is None:
+            artists = self._artists_by_track[track_id] = _format_artists(track)
+        return artists
 
     def init_db(self, connection: sqlite3.Connection) -> None:
+        # journal_mode cannot change inside a transaction, so this runs first.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA cache_size=-65536")
+        connection.execute("PRAGMA mmap_size=268435456")
         connection.executescript(
             """
             CREATE TABLE IF NOT EXISTS ingest_runs (
@@ -197,6 +417,7 @@ class SyncService:
         }
 
     def run_standard_sync(self, connection: sqlite3.Connection, since: str | None) -> SyncSummary:
+        self._artists_by_track.clear()
         now = datetime.now(tz=timezone.utc).isoformat()
         ingest_columns = self._ingest_runs_columns(connection)
 
@@ -219,10 +440,17 @@ class SyncService:
         finished_column = "completed_at" if "completed_at" in ingest_columns else ("finished_at" if "finished_at" in ingest_columns else None)
 
         try:
-            saved_count = self._ingest_saved_tracks(connection, since)
-            playlist_count = self._ingest_playlists(connection)
-            top_count = self._ingest_top_items(connection, run_id)
-            recent_count = self._ingest_recently_played(connection, since)
+            payload = self._fetch_payload(since)
+            # Every API call is done before the write lock is taken, so other
+            # writers are only blocked for the one short transaction that
+            # stores the whole sync (a single commit instead of one per table).
+            connection.execute("BEGIN IMMEDIATE")
+            saved_count = self._ingest_saved_tracks(connection, since, payload.saved_tracks)
+            playlist_count = self._ingest_playlists(
+                connection, payload.playlists, payload.playlist_tracks
+            )
+            top_count = self._ingest_top_items(connection, run_id, payload.top_items)
+            recent_count = self._ingest_recently_played(connection, since, payload.recently_played)
 
             updates: list[str] = []
             params: list[str] = []
@@ -247,6 +475,8 @@ class SyncService:
                 recent_tracks=recent_count,
             )
         except Exception as exc:
+            # Drop the partial ingest; only the run row records the failure.
+            connection.rollback()
             updates = []
             params = []
             if finished_column:
@@ -267,9 +497,33 @@ class SyncService:
             connection.commit()
             raise
 
-    def _ingest_saved_tracks(self, connection: sqlite3.Connection, since: str | None) -> int:
-        items = self._client.get_saved_tracks(since)
-        inserted = 0
+    def _fetch_payload(self, since: str | None) -> _SyncPayload:
+        saved_tracks = self._client.get_saved_tracks(since)
+        playlists = _playlist_rows(self._client.get_playlists())
+        playlist_tracks = self._fetch_playlist_tracks(playlists)
+        top_items = [
+            (time_range, item_type, fetch(time_range))
+            for time_range in TOP_TIME_RANGES
+            for item_type, fetch in (
+                ("track", self._client.get_top_tracks),
+                ("artist", self._client.get_top_artists),
+            )
+        ]
+        return _SyncPayload(
+            saved_tracks=saved_tracks,
+            playlists=playlists,
+            playlist_tracks=playlist_tracks,
+            top_items=top_items,
+            recently_played=self._client.get_recently_played(since),
+        )
+
+    def _ingest_saved_tracks(
+        self, connection: sqlite3.Connection, since: str | None, items: list[dict[str, Any]]
+    ) -> int:
+        existing = _existing_keys(
+            connection, "SELECT track_id, added_at FROM saved_tracks", "added_at", since
+        )
+        rows: list[tuple[str, str, str, str, str]] = []
         for item in items:
             added_at = item.get("added_at")
             track = item.get("track") or {}
@@ -280,101 +534,129 @@ class SyncService:
             track_id = track.get("id")
             track_name = track.get("name")
             album = ((track.get("album") or {}).get("name")) if isinstance(track.get("album"), dict) else ""
-            artists = ", ".join(
-                artist.get("name", "")
-                for artist in track.get("artists", [])
-                if isinstance(artist, dict)
-            )
             if not isinstance(track_id, str) or not isinstance(track_name, str):
                 continue
-            cursor = connection.execute(
-                """
-                INSERT OR IGNORE INTO saved_tracks (track_id, added_at, name, artists, album)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (track_id, added_at, track_name, artists, album or ""),
-            )
-            inserted += cursor.rowcount
-        connection.commit()
-        return inserted
-
-    def _ingest_playlists(self, connection: sqlite3.Connection) -> int:
-        playlists = self._client.get_playlists()
-        inserted = 0
-        for playlist in playlists:
-            playlist_id = playlist.get("id")
-            playlist_name = str(playlist.get("name", ""))
-            owner = playlist.get("owner") or {}
-            owner_id = owner.get("id") if isinstance(owner, dict) else None
-            if not isinstance(playlist_id, str) or not isinstance(owner_id, str):
+            # Recording each new key also drops repeats within this response,
+            # which is what lets the insert below be a plain INSERT.
+            key = (track_id, added_at)
+            if key in existing:
                 continue
-            connection.execute(
-                "INSERT OR REPLACE INTO playlists (id, name, owner_id) VALUES (?, ?, ?)",
-                (playlist_id, playlist_name, owner_id),
-            )
-            try:
-                playlist_tracks = self._client.get_playlist_tracks(playlist_id)
-            except SpotifyAPIError as exc:
-                if exc.status_code == 403:
-                    LOGGER.warning(
-                        "Skipping playlist due to 403 Forbidden: id=%s name=%s",
-                        playlist_id,
-                        playlist_name,
-                    )
-                    continue
-                raise
+            existing.add(key)
+            rows.append((track_id, added_at, track_name, self._artists(track_id, track), album or ""))
+        return _insert_many(
+            connection,
+            """
+            INSERT INTO saved_tracks (track_id, added_at, name, artists, album)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+
+    def _ingest_playlists(
+        self,
+        connection: sqlite3.Connection,
+        playlist_rows: list[tuple[str, str, str]],
+        fetched_tracks: list[tuple[str, list[dict[str, Any]]]],
+    ) -> int:
+        track_rows: list[tuple[str, str, Any, int, str, str]] = []
+        for playlist_id, playlist_tracks in fetched_tracks:
             for idx, item in enumerate(playlist_tracks):
                 track = item.get("track") or {}
                 if not isinstance(track, dict):
                     continue
                 track_id = track.get("id")
                 track_name = track.get("name")
-                artists = ", ".join(
-                    artist.get("name", "")
-                    for artist in track.get("artists", [])
-                    if isinstance(artist, dict)
-                )
                 if not isinstance(track_id, str) or not isinstance(track_name, str):
                     continue
-                cursor = connection.execute(
-                    """
-                    INSERT OR IGNORE INTO playlist_tracks
-                    (playlist_id, track_id, added_at, position, track_name, artists)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (playlist_id, track_id, item.get("added_at"), idx, track_name, artists),
+                track_rows.append(
+                    (playlist_id, track_id, item.get("added_at"), idx, track_name, self._artists(track_id, track))
                 )
-                inserted += cursor.rowcount
-        connection.commit()
-        return inserted
+        # Only rewrite playlists that are new or renamed/re-owned; an unchanged
+        # library costs one SELECT instead of a REPLACE per playlist.
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        stored = {
+            playlist_id: (name, owner_id)
+            for playlist_id, name, owner_id in cursor.execute("SELECT id, name, owner_id FROM playlists")
+        }
+        connection.executemany(
+            "INSERT OR REPLACE INTO playlists (id, name, owner_id) VALUES (?, ?, ?)",
+            (row for row in playlist_rows if stored.get(row[0]) != row[1:]),
+        )
+        return _insert_many(
+            connection,
+            """
+            INSERT OR IGNORE INTO playlist_tracks
+            (playlist_id, track_id, added_at, position, track_name, artists)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            track_rows,
+        )
 
-    def _ingest_top_items(self, connection: sqlite3.Connection, run_id: int) -> int:
-        inserted = 0
-        for time_range in TOP_TIME_RANGES:
-            for item_type, fetch in (
-                ("track", self._client.get_top_tracks),
-                ("artist", self._client.get_top_artists),
-            ):
-                for rank, item in enumerate(fetch(time_range), start=1):
-                    item_id = item.get("id")
-                    name = item.get("name")
-                    if not isinstance(item_id, str) or not isinstance(name, str):
-                        continue
-                    cursor = connection.execute(
-                        """
-                        INSERT OR IGNORE INTO top_items
-                        (item_id, item_type, time_range, rank, name, run_id)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                        (item_id, item_type, time_range, rank, name, run_id),
+    def _fetch_playlist_tracks(
+        self, playlist_rows: list[tuple[str, str, str]]
+    ) -> list[tuple[str, list[dict[str, Any]]]]:
+        def fetch(row: tuple[str, str, str]) -> list[dict[str, Any]] | None:
+            playlist_id, playlist_name, _owner_id = row
+            try:
+                return self._client.get_playlist_tracks(playlist_id)
+            except SpotifyAPIError as exc:
+                if exc.status_code == 403:
+                    LOGGER.warning(
+                        "Skipping playlist due to 403 Forbidden: id=%s name=%s",
+                        playlist_id,
+                        playlist_name,
                     )
-                    inserted += cursor.rowcount
-        connection.commit()
-        return inserted
+                    return None
+                raise
+
+        # Each playlist's tracks are independent requests, so they share the
+        # client's request pool; results still come back in playlist order.
+        results = self._client.run_concurrently(fetch, playlist_rows)
+        return [
+            (playlist_id, tracks)
+            for (playlist_id, _name, _owner_id), tracks in zip(playlist_rows, results)
+            if tracks is not None
+        ]
+
+    def _ingest_top_items(
+        self,
+        connection: sqlite3.Connection,
+        run_id: int,
+        top_items: list[tuple[str, str, list[dict[str, Any]]]],
+    ) -> int:
+        rows: list[tuple[str, str, str, int, str, int]] = []
+        for time_range, item_type, items in top_items:
+            for rank, item in enumerate(items, start=1):
+                item_id = item.get("id")
+                name = item.get("name")
+                if not isinstance(item_id, str) or not isinstance(name, str):
+                    continue
+                rows.append((item_id, item_type, time_range, rank, name, run_id))
+        return _insert_many(
+            connection,
+            """
+            INSERT OR IGNORE INTO top_items
+            (item_id, item_type, time_range, rank, name, run_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
 
-    def _ingest_recently_played(self, connection: sqlite3.Connection, since: str | None) -> int:
-        inserted = 0
-        for item in self._client.get_recently_played(since):
+    def _ingest_recently_played(
+        self, connection: sqlite3.Connection, since: str | None, items: list[dict[str, Any]]
+    ) -> int:
+        played = [item["played_at"] for item in items if isinstance(item.get("played_at"), str)]
+        if not played:
+            return 0
+        # Only rows at or after the oldest fetched play can collide, so a
+        # sync without ``since`` still reads a window, not the whole table.
+        window_start = max(min(played), since) if since else min(played)
+        existing = _existing_keys(
+            connection, "SELECT played_at, track_id FROM recently_played", "played_at", window_start
+        )
+        rows: list[tuple[str, str, str, str]] = []
+        for item in items:
             played_at = item.get("played_at")
             track = item.get("track") or {}
             if not isinstance(played_at, str) or not isinstance(track, dict):
@@ -383,20 +665,18 @@ class SyncService:
                 continue
             track_id = track.get("id")
             track_name = track.get("name")
-            artists = ", ".join(
-                artist.get("name", "")
-                for artist in track.get("artists", [])
-                if isinstance(artist, dict)
-            )
             if not isinstance(track_id, str) or not isinstance(track_name, str):
                 continue
-            cursor = connection.execute(
-                """
-                INSERT OR IGNORE INTO recently_played (played_at, track_id, track_name, artists)
-                VALUES (?, ?, ?, ?)
-                """,
-                (played_at, track_id, track_name, artists),
-            )
-            inserted += cursor.rowcount
-        connection.commit()
-        return inserted
+            key = (played_at, track_id)
+            if key in existing:
+                continue
+            existing.add(key)
+            rows.append((played_at, track_id, track_name, self._artists(track_id, track)))
+        return _insert_many(
+            connection,
+            """
+            INSERT INTO recently_played (played_at, track_id, track_name, artists)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
+        )
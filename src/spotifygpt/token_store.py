@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import json
 import os
-import stat
+import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -21,26 +22,42 @@ class StoredToken:
 
     @property
     def is_expired(self) -> bool:
-        from time import time
-
-        return int(time()) >= self.expires_at
+        return int(time.time()) >= self.expires_at
 
 
 class TokenStore:
     def __init__(self, path: Path | None = None) -> None:
         self.path = path or (Path.home() / ".spotifygpt" / "tokens.json")
+        # Last parsed token keyed by the file's (mtime_ns, size, inode): repeat
+        # loads cost one stat() until something rewrites the file. Every save
+        # renames a fresh file into place, so the inode changes even when the
+        # mtime and size happen to match.
+        self._cache: tuple[tuple[int, int, int], StoredToken] | None = None
+
+    def _file_signature(self) -> tuple[int, int, int] | None:
+        try:
+            file_stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
 
     def load(self) -> StoredToken | None:
-        if not self.path.exists():
+        signature = self._file_signature()
+        if signature is None:
+            self._cache = None
             return None
-        data = json.loads(self.path.read_text(encoding="utf-8"))
-        return StoredToken(
+        if self._cache is not None and self._cache[0] == signature:
+            return self._cache[1]
+        data = json.loads(self.path.read_bytes())
+        token = StoredToken(
             access_token=str(data["access_token"]),
             refresh_token=str(data["refresh_token"]),
             token_type=str(data.get("token_type", "Bearer")),
             scope=str(data.get("scope", "")),
             expires_at=int(data["expires_at"]),
         )
+        self._cache = (signature, token)
+        return token
 
     def save(self, token: StoredToken) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -51,9 +68,23 @@ class TokenStore:
             "scope": token.scope,
             "expires_at": token.expires_at,
         }
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        if os.name == "posix":
-            os.chmod(self.path, stat.S_IRUSR | stat.S_IWUSR)
+        # Write a private temp file and rename it over the old one: a crash
+        # mid-write can no longer leave an empty tokens.json, and the token is
+        # never readable with wider permissions, not even briefly. mkstemp
+        # picks a unique 0600 name, so concurrent savers never share a file.
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp")
+        temp_path = Path(temp_name)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(json.dumps(payload, indent=2).encode("utf-8"))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        signature = self._file_signature()
+        self._cache = None if signature is None else (signature, token)
 
     def store_from_oauth(self, token: OAuthTokenResponse, fallback_refresh_token: str | None = None) -> StoredToken:
         refresh_token = token.refresh_token or fallback_refresh_token
@@ -74,9 +105,7 @@ class TokenStore:
         if token is None:
             raise RuntimeError("No stored token found. Run auth first.")
 
-        from time import time
-
-        if int(time()) < (token.expires_at - refresh_margin_seconds):
+        if int(time.time()) < (token.expires_at - refresh_margin_seconds):
             return token.access_token
 
         refreshed = refresh_access_token(config, token.refresh_token)
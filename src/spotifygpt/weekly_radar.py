@@ -34,33 +34,74 @@ class WeeklyRadarResult:
     tracks: list[WeeklyRadarTrack]
 
 
+@dataclass(slots=True)
+class _TrackTally:
+    track_name: str
+    artist_name: str
+    play_count: int = 0
+    total_ms: int = 0
+
+
 def _summarize_tracks(streams: Iterable[Stream]) -> list[TrackStats]:
-    stats: dict[str, TrackStats] = {}
+    tallies: dict[str, _TrackTally] = {}
     for stream in streams:
-        if stream.track_key not in stats:
-            stats[stream.track_key] = TrackStats(
-                track_key=stream.track_key,
-                track_name=stream.track_name,
-                artist_name=stream.artist_name,
-                play_count=1,
-                total_ms=stream.ms_played,
-            )
-        else:
-            current = stats[stream.track_key]
-            stats[stream.track_key] = TrackStats(
-                track_key=current.track_key,
-                track_name=current.track_name,
-                artist_name=current.artist_name,
-                play_count=current.play_count + 1,
-                total_ms=current.total_ms + stream.ms_played,
+        tally = tallies.get(stream.track_key)
+        if tally is None:
+            tally = tallies[stream.track_key] = _TrackTally(
+                stream.track_name, stream.artist_name
             )
+        tally.play_count += 1
+        tally.total_ms += stream.ms_played
+    stats = [
+        TrackStats(
+            track_key=track_key,
+            track_name=tally.track_name,
+            artist_name=tally.artist_name,
+            play_count=tally.play_count,
+            total_ms=tally.total_ms,
+        )
+        for track_key, tally in tallies.items()
+    ]
     return sorted(
-        stats.values(),
+        stats,
         key=lambda item: (item.total_ms, item.play_count, item.track_name),
         reverse=True,
     )
 
 
+def _summarize_tracks_sql(connection) -> list[TrackStats]:
+    """Same tallies and order as ``_summarize_tracks``, aggregated in SQLite."""
+
+    # MIN(id) pins the bare name columns to each track's first stream and
+    # breaks full ties in first-seen order, as the stable Python sort did.
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    rows = cursor.execute(
+        """
+        SELECT
+            track_key,
+            track_name,
+            artist_name,
+            COUNT(*) AS play_count,
+            SUM(ms_played) AS total_ms,
+            MIN(id) AS first_id
+        FROM streams
+        GROUP BY track_key
+        ORDER BY total_ms DESC, play_count DESC, track_name DESC, first_id
+        """
+    )
+    return [
+        TrackStats(
+            track_key=track_key,
+            track_name=track_name,
+            artist_name=artist_name,
+            play_count=play_count,
+            total_ms=total_ms,
+        )
+        for track_key, track_name, artist_name, play_count, total_ms, _first_id in rows
+    ]
+
+
 def _clamp_size(size: int, total_tracks: int) -> int:
     bounded = min(max(size, 30), 40)
     return min(bounded, total_tracks)
@@ -109,41 +150,31 @@ def _order_blocks(
     core_size = min(core_size, size - entry_size)
     exit_size = size - entry_size - core_size
 
-    blocks = [
-        ("entry", ordered_stats[:entry_size]),
-        ("core", ordered_stats[entry_size : entry_size + core_size]),
-        ("exit", ordered_stats[entry_size + core_size :]),
-    ]
+    # Categories and blocks are both contiguous runs over ordered_stats, so
+    # each track's labels come straight from its position.
+    categories = (
+        ["anchor"] * len(anchors)
+        + ["transition"] * len(transitions)
+        + ["exploration"] * len(exploration)
+    )
+    block_names = ["entry"] * entry_size + ["core"] * core_size + ["exit"] * exit_size
 
-    tracks: list[WeeklyRadarTrack] = []
-    position = 1
-    for block_name, block_tracks in blocks:
-        for stat in block_tracks:
-            if stat in anchors:
-                category = "anchor"
-            elif stat in transitions:
-                category = "transition"
-            else:
-                category = "exploration"
-            tracks.append(
-                WeeklyRadarTrack(
-                    track_key=stat.track_key,
-                    track_name=stat.track_name,
-                    artist_name=stat.artist_name,
-                    category=category,
-                    block=block_name,
-                    position=position,
-                )
-            )
-            position += 1
-    return tracks
+    return [
+        WeeklyRadarTrack(
+            track_key=stat.track_key,
+            track_name=stat.track_name,
+            artist_name=stat.artist_name,
+            category=category,
+            block=block_name,
+            position=position,
+        )
+        for position, (stat, category, block_name) in enumerate(
+            zip(ordered_stats, categories, block_names), start=1
+        )
+    ]
 
 
-def generate_weekly_radar(
-    streams: Iterable[Stream],
-    size: int = 36,
-) -> WeeklyRadarResult:
-    stats = _summarize_tracks(streams)
+def _build_weekly_radar(stats: list[TrackStats], size: int) -> WeeklyRadarResult:
     if not stats:
         return WeeklyRadarResult(tracks=[])
     final_size = _clamp_size(size, len(stats))
@@ -158,6 +189,19 @@ def generate_weekly_radar(
     return WeeklyRadarResult(tracks=tracks)
 
 
+def generate_weekly_radar(
+    streams: Iterable[Stream],
+    size: int = 36,
+) -> WeeklyRadarResult:
+    return _build_weekly_radar(_summarize_tracks(streams), size)
+
+
+def generate_weekly_radar_from_db(connection, size: int = 36) -> WeeklyRadarResult:
+    """Build the radar from the ``streams`` table without loading every row."""
+
+    return _build_weekly_radar(_summarize_tracks_sql(connection), size)
+
+
 def store_weekly_radar_json(result: WeeklyRadarResult, path: Path | str) -> None:
     target = Path(path)
     payload = {
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+from typing import Callable, Iterator
+
+import pytest
+
+from spotifygpt.audio_features import init_audio_feature_tables
+from spotifygpt.importer import init_db
+from spotifygpt.manual_import import init_manual_import_tables
+
+
+@pytest.fixture(scope="session")
+def _template_db() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    init_db(connection)
+    init_manual_import_tables(connection)
+    init_audio_feature_tables(connection)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def connection(_template_db: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Fresh in-memory database with the full schema, page-copied from a template."""
+
+    fresh = sqlite3.connect(":memory:")
+    _template_db.backup(fresh)
+    yield fresh
+    fresh.close()
+
+
+@pytest.fixture
+def tune_sqlite() -> Callable[[Path], None]:
+    """Switch a file database to WAL so each CLI commit appends instead of journaling.
+
+    Only the journal mode is stored in the file; per-connection pragmas such as
+    ``synchronous`` would not reach the connections the CLI opens itself.
+    """
+
+    def tune(db_path: Path) -> None:
+        connection = sqlite3.connect(db_path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+        finally:
+            connection.close()
+
+    return tune
@@ -8,10 +8,7 @@ from spotifygpt.audio_features import (
     BackfillCandidate,
     SpotifyWebApiAudioFeatureProvider,
     backfill_audio_features,
-    init_audio_feature_tables,
 )
-from spotifygpt.importer import init_db
-from spotifygpt.manual_import import init_manual_import_tables
 
 
 class FakeProvider:
@@ -46,47 +43,51 @@ def _seed_streams(connection: sqlite3.Connection) -> None:
     connection.commit()
 
 
-def _insert_track(connection: sqlite3.Connection, track_key: str, track_name: str, artist_name: str) -> int:
-    connection.execute(
+def _insert_tracks(connection: sqlite3.Connection, rows: list[tuple[str, str, str]]) -> dict[str, int]:
+    """Insert (track_key, track_name, artist_name) rows; return track_key -> id."""
+
+    connection.executemany(
         """
         INSERT OR IGNORE INTO tracks (spotify_uri, track_name, artist_name, track_key)
-        VALUES (?, ?, ?, ?)
+        VALUES (NULL, ?, ?, ?)
         """,
-        (None, track_name, artist_name, track_key),
+        [(track_name, artist_name, track_key) for track_key, track_name, artist_name in rows],
+    )
+    keys = json.dumps([track_key for track_key, _name, _artist in rows])
+    return dict(
+        connection.execute(
+            "SELECT track_key, id FROM tracks WHERE track_key IN (SELECT value FROM json_each(?))",
+            (keys,),
+        )
     )
-    row = connection.execute("SELECT id FROM tracks WHERE track_key = ?", (track_key,)).fetchone()
-    return int(row[0])
 
 
 def _seed_library(connection: sqlite3.Connection, rows: list[tuple[str, str, str]]) -> None:
-    for track_key, track_name, artist_name in rows:
-        track_id = _insert_track(connection, track_key, track_name, artist_name)
-        connection.execute(
+    with connection:
+        track_ids = _insert_tracks(connection, rows)
+        connection.executemany(
             "INSERT INTO library (track_id, added_at) VALUES (?, ?)",
-            (track_id, "2026-01-01T00:00:00Z"),
+            [(track_ids[track_key], "2026-01-01T00:00:00Z") for track_key, _name, _artist in rows],
         )
-    connection.commit()
 
 
 def _seed_playlist_tracks(connection: sqlite3.Connection, rows: list[tuple[str, str, str]]) -> None:
-    connection.execute("INSERT INTO playlists (name) VALUES (?)", ("Focus",))
-    playlist_id = int(connection.execute("SELECT id FROM playlists WHERE name = ?", ("Focus",)).fetchone()[0])
-    for index, (track_key, track_name, artist_name) in enumerate(rows, start=1):
-        track_id = _insert_track(connection, track_key, track_name, artist_name)
-        connection.execute(
+    with connection:
+        playlist_id = connection.execute("INSERT INTO playlists (name) VALUES (?)", ("Focus",)).lastrowid
+        track_ids = _insert_tracks(connection, rows)
+        connection.executemany(
             """
             INSERT INTO playlist_tracks (playlist_id, track_id, position, added_at)
             VALUES (?, ?, ?, ?)
             """,
-            (playlist_id, track_id, index, "2026-01-01T00:00:00Z"),
+            [
+                (playlist_id, track_ids[track_key], index, "2026-01-01T00:00:00Z")
+                for index, (track_key, _name, _artist) in enumerate(rows, start=1)
+            ],
         )
-    connection.commit()
 
 
-def test_backfill_audio_features_inserts_missing_tracks() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_inserts_missing_tracks(connection: sqlite3.Connection) -> None:
     _seed_streams(connection)
 
     provider = FakeProvider()
@@ -100,12 +101,13 @@ def test_backfill_audio_features_inserts_missing_tracks() -> None:
 
     stored = connection.execute("SELECT COUNT(*) FROM audio_features").fetchone()[0]
     assert stored == 3
+    # The writer refreshes planner stats so profile reads never have to.
+    assert connection.execute(
+        "SELECT 1 FROM sqlite_stat1 WHERE tbl = 'audio_features'"
+    ).fetchone()
 
 
-def test_backfill_audio_features_uses_cache_on_second_run() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_uses_cache_on_second_run(connection: sqlite3.Connection) -> None:
     _seed_streams(connection)
 
     provider = FakeProvider()
@@ -123,10 +125,7 @@ def test_backfill_audio_features_uses_cache_on_second_run() -> None:
     assert provider.calls == 1
 
 
-def test_backfill_audio_features_since_filter() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_since_filter(connection: sqlite3.Connection) -> None:
     _seed_streams(connection)
 
     provider = FakeProvider()
@@ -144,11 +143,7 @@ def test_backfill_audio_features_since_filter() -> None:
     assert keys == {"key-c"}
 
 
-def test_backfill_audio_features_reads_library_when_streams_empty() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_manual_import_tables(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_reads_library_when_streams_empty(connection: sqlite3.Connection) -> None:
     _seed_library(connection, [("lib-key-1", "Track L1", "Artist L")])
 
     provider = FakeProvider()
@@ -163,11 +158,7 @@ def test_backfill_audio_features_reads_library_when_streams_empty() -> None:
     assert keys == {"lib-key-1"}
 
 
-def test_backfill_audio_features_reads_playlist_tracks() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_manual_import_tables(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_reads_playlist_tracks(connection: sqlite3.Connection) -> None:
     _seed_playlist_tracks(connection, [("pl-key-1", "Track P1", "Artist P")])
 
     provider = FakeProvider()
@@ -182,11 +173,7 @@ def test_backfill_audio_features_reads_playlist_tracks() -> None:
     assert keys == {"pl-key-1"}
 
 
-def test_backfill_audio_features_dedupes_manual_sources() -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_manual_import_tables(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_audio_features_dedupes_manual_sources(connection: sqlite3.Connection) -> None:
     shared_key = "shared-key"
     _seed_playlist_tracks(connection, [(shared_key, "Track Shared", "Artist Shared")])
     _seed_library(connection, [(shared_key, "Track Shared", "Artist Shared")])
@@ -213,23 +200,18 @@ class _FakeSpotifyResponse:
         return None
 
 
-def test_spotify_provider_batches_100_and_skips_null_rows(monkeypatch) -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_manual_import_tables(connection)
-    init_audio_feature_tables(connection)
-
+def test_spotify_provider_batches_100_and_skips_null_rows(connection: sqlite3.Connection, monkeypatch) -> None:
     connection.execute("INSERT INTO playlists (name) VALUES (?)", ("P",))
     playlist_id = int(connection.execute("SELECT id FROM playlists").fetchone()[0])
-    for i in range(101):
-        spotify_id = f"id-{i}"
-        track_key = f"key-{i}"
-        track_id = _insert_track(connection, track_key, f"Track {i}", "Artist")
-        connection.execute("UPDATE tracks SET spotify_uri = ? WHERE id = ?", (f"spotify:track:{spotify_id}", track_id))
-        connection.execute(
-            "INSERT INTO playlist_tracks (playlist_id, track_id, position, added_at) VALUES (?, ?, ?, ?)",
-            (playlist_id, track_id, i + 1, "2026-01-01T00:00:00Z"),
-        )
+    track_ids = _insert_tracks(connection, [(f"key-{i}", f"Track {i}", "Artist") for i in range(101)])
+    connection.executemany(
+        "UPDATE tracks SET spotify_uri = ? WHERE id = ?",
+        [(f"spotify:track:id-{i}", track_ids[f"key-{i}"]) for i in range(101)],
+    )
+    connection.executemany(
+        "INSERT INTO playlist_tracks (playlist_id, track_id, position, added_at) VALUES (?, ?, ?, ?)",
+        [(playlist_id, track_ids[f"key-{i}"], i + 1, "2026-01-01T00:00:00Z") for i in range(101)],
+    )
     connection.commit()
 
     calls: list[object] = []
@@ -268,11 +250,7 @@ def test_spotify_provider_batches_100_and_skips_null_rows(monkeypatch) -> None:
     assert calls[0].get_header("Authorization") == "Bearer token"
 
 
-def test_backfill_skips_existing_audio_features(monkeypatch) -> None:
-    connection = sqlite3.connect(":memory:")
-    init_db(connection)
-    init_manual_import_tables(connection)
-    init_audio_feature_tables(connection)
+def test_backfill_skips_existing_audio_features(connection: sqlite3.Connection, monkeypatch) -> None:
     _seed_playlist_tracks(connection, [("pl-key-1", "Track P1", "Artist P")])
 
     connection.execute(
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 import json
+import shutil
 import sqlite3
 
+import pytest
+
 from spotifygpt.audio_features import AudioFeatures, BackfillCandidate
 from spotifygpt.cli import main
 
@@ -11,6 +14,15 @@ from spotifygpt.cli import main
 SAMPLE_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
 
 
+@pytest.fixture(scope="session")
+def imported_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """The sample history imported once; tests work on their own copy."""
+
+    db_path = tmp_path_factory.mktemp("imported") / "streams.db"
+    assert main(["import", str(SAMPLE_DIR), str(db_path)]) == 0
+    return db_path
+
+
 class FakeProvider:
     def fetch(self, candidate: BackfillCandidate) -> AudioFeatures | None:
         return AudioFeatures(
@@ -23,10 +35,10 @@ class FakeProvider:
         )
 
 
-def test_cli_backfill_features(monkeypatch, tmp_path: Path) -> None:
+def test_cli_backfill_features(monkeypatch, tmp_path: Path, imported_db: Path, tune_sqlite) -> None:
     db_path = tmp_path / "streams.db"
-
-    assert main(["import", str(SAMPLE_DIR), str(db_path)]) == 0
+    shutil.copyfile(imported_db, db_path)
+    tune_sqlite(db_path)
     monkeypatch.setattr("spotifygpt.cli._build_audio_feature_provider", lambda _args: FakeProvider())
 
     assert main(["backfill-features", str(db_path), "--limit", "2"]) == 0
@@ -37,14 +49,13 @@ def test_cli_backfill_features(monkeypatch, tmp_path: Path) -> None:
     assert count == 2
 
 
-def test_cli_backfill_invalid_since(tmp_path: Path) -> None:
+def test_cli_backfill_invalid_since(tmp_path: Path, imported_db: Path) -> None:
     db_path = tmp_path / "streams.db"
-
-    assert main(["import", str(SAMPLE_DIR), str(db_path)]) == 0
+    shutil.copyfile(imported_db, db_path)
     assert main(["backfill-features", str(db_path), "--since", "not-a-date"]) == 1
 
 
-def test_cli_backfill_features_without_streams_uses_manual_import(monkeypatch, tmp_path: Path) -> None:
+def test_cli_backfill_features_without_streams_uses_manual_import(monkeypatch, tmp_path: Path, tune_sqlite) -> None:
     db_path = tmp_path / "manual.db"
     liked_path = tmp_path / "liked.json"
     playlists_path = tmp_path / "playlists.json"
@@ -78,6 +89,7 @@ def test_cli_backfill_features_without_streams_uses_manual_import(monkeypatch, t
         )
         == 0
     )
+    tune_sqlite(db_path)
     monkeypatch.setattr("spotifygpt.cli._build_audio_feature_provider", lambda _args: FakeProvider())
 
     assert main(["backfill-features", str(db_path), "--limit", "5"]) == 0
@@ -102,7 +114,7 @@ class _FakeSpotifyResponse:
         return None
 
 
-def test_cli_backfill_defaults_to_spotify_provider(monkeypatch, tmp_path: Path) -> None:
+def test_cli_backfill_defaults_to_spotify_provider(monkeypatch, tmp_path: Path, tune_sqlite) -> None:
     db_path = tmp_path / "manual.db"
     liked_path = tmp_path / "liked.json"
     playlists_path = tmp_path / "playlists.json"
@@ -124,6 +136,7 @@ def test_cli_backfill_defaults_to_spotify_provider(monkeypatch, tmp_path: Path)
     playlists_path.write_text("[]", encoding="utf-8")
 
     assert main(["import-manual", "--liked", str(liked_path), "--playlists", str(playlists_path), "--db", str(db_path)]) == 0
+    tune_sqlite(db_path)
 
     def fake_urlopen(request, timeout=20):
         assert request.get_header("Authorization") == "Bearer secret"
@@ -147,9 +160,9 @@ def test_cli_backfill_defaults_to_spotify_provider(monkeypatch, tmp_path: Path)
     assert main(["backfill-features", str(db_path), "--limit", "1"]) == 0
 
 
-def test_cli_backfill_missing_provider_config(tmp_path: Path, capsys) -> None:
+def test_cli_backfill_missing_provider_config(tmp_path: Path, capsys, imported_db: Path) -> None:
     db_path = tmp_path / "streams.db"
-    assert main(["import", str(SAMPLE_DIR), str(db_path)]) == 0
+    shutil.copyfile(imported_db, db_path)
 
     assert main(["backfill-features", str(db_path)]) == 1
     captured = capsys.readouterr()
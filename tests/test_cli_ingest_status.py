@@ -6,8 +6,9 @@ import sqlite3
 from spotifygpt.cli import main
 
 
-def test_cli_ingest_status(tmp_path: Path, capsys) -> None:
+def test_cli_ingest_status(tmp_path: Path, capsys, tune_sqlite) -> None:
     db_path = tmp_path / "ingest.db"
+    tune_sqlite(db_path)
     with sqlite3.connect(db_path) as connection:
         connection.executescript(
             """
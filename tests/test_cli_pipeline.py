@@ -3,7 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 import sqlite3
 
+from spotifygpt import pipeline
 from spotifygpt.cli import main
+from spotifygpt.importer import init_db
 
 
 SAMPLE_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
@@ -35,3 +37,71 @@ def test_end_to_end_cli_pipeline(tmp_path: Path) -> None:
     assert weekly_count == 3
     assert daily_count == 1
     assert alert_count == 0
+
+
+def test_fetch_streams_reads_across_batches(monkeypatch) -> None:
+    monkeypatch.setattr(pipeline, "STREAM_FETCH_BATCH", 2)
+    connection = sqlite3.connect(":memory:")
+    init_db(connection)
+    connection.executemany(
+        """
+        INSERT INTO streams (track_name, artist_name, end_time, ms_played, track_key)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [("Song", "Artist", f"2024-01-0{day} 10:00", 1000, "key") for day in range(1, 6)],
+    )
+
+    streams = pipeline.fetch_streams(connection)
+
+    assert [stream.end_time.day for stream in streams] == [1, 2, 3, 4, 5]
+
+
+def test_run_pipeline_matches_individual_steps(tmp_path: Path) -> None:
+    db_path = tmp_path / "streams.db"
+    assert main(["import", str(SAMPLE_DIR), str(db_path)]) == 0
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("DROP TABLE alerts")
+        pipeline.init_pipeline_tables(connection)
+        result = pipeline.run_pipeline(connection)
+
+    with sqlite3.connect(db_path) as connection:
+        metrics_count = connection.execute("SELECT COUNT(*) FROM metrics").fetchone()[0]
+        classifications_count = connection.execute(
+            "SELECT COUNT(*) FROM classifications"
+        ).fetchone()[0]
+        weekly_count = connection.execute(
+            "SELECT COUNT(*) FROM weekly_radar"
+        ).fetchone()[0]
+        daily_count = connection.execute("SELECT COUNT(*) FROM daily_mode").fetchone()[0]
+
+    assert len(result.metrics) == metrics_count == 4
+    assert len(result.classifications) == classifications_count == 3
+    assert len(result.weekly_radar) == weekly_count == 3
+    assert result.daily_mode is not None
+    assert daily_count == 1
+    assert result.alerts == []
+
+
+def test_generate_alerts_flags_dominant_track() -> None:
+    connection = sqlite3.connect(":memory:")
+    init_db(connection)
+    connection.execute("DROP TABLE alerts")
+    pipeline.init_pipeline_tables(connection)
+    connection.executemany(
+        """
+        INSERT INTO streams (track_name, artist_name, end_time, ms_played, track_key)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            ("Big", "Artist", "2024-01-01 10:00", 3000, "big"),
+            ("Small", "Artist", "2024-01-01 11:00", 1000, "small"),
+        ],
+    )
+
+    alerts = pipeline.generate_alerts(connection)
+
+    assert [alert.message for alert in alerts] == [
+        "Dominant track detected: Big by Artist accounted for 75% of playtime."
+    ]
+    assert connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0] == 1
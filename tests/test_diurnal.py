@@ -10,6 +10,7 @@ from spotifygpt.diurnal import (
     LATE_NIGHT,
     MORNING,
     NIGHT,
+    _minute_table,
     get_feature_prior,
     get_time_block,
 )
@@ -55,3 +56,8 @@ def test_feature_prior_is_deterministic_and_copy_safe():
 def test_feature_prior_unknown_block_raises():
     with pytest.raises(ValueError, match="Unknown time block"):
         get_feature_prior("SUNRISE")
+
+
+def test_minute_table_rejects_schedule_gaps():
+    with pytest.raises(RuntimeError, match="Unsupported minute_of_day value: 120"):
+        _minute_table(((NIGHT, 0, 119), (MORNING, 121, 1439)))
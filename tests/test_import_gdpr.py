@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from hashlib import sha256
 from pathlib import Path
 import sqlite3
 import zipfile
 
 from spotifygpt.cli import main
-from spotifygpt.importer import import_gdpr, init_db
+from spotifygpt.importer import _compute_dedup_key, import_gdpr, init_db
 
 
 SAMPLE_GDPR_DIR = Path(__file__).resolve().parents[1] / "data" / "sample_gdpr"
@@ -51,3 +52,17 @@ def test_cli_import_gdpr(tmp_path: Path) -> None:
 
     assert code == 0
     assert count == 2
+
+
+def test_dedup_key_matches_pipe_joined_payload() -> None:
+    row = {
+        "ts": "2024-01-01T10:00:00Z",
+        "master_metadata_track_name": "Track One",
+        "master_metadata_album_artist_name": "Artist A",
+        "ms_played": 120000,
+        "spotify_track_uri": None,
+        "platform": "android",
+    }
+
+    payload = "2024-01-01T10:00:00Z|Track One|Artist A|120000|None|android||"
+    assert _compute_dedup_key(row) == sha256(payload.encode("utf-8")).hexdigest()
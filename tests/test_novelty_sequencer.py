@@ -52,3 +52,13 @@ def test_graceful_fallback_with_empty_anchors() -> None:
 def test_empty_candidates_returns_empty_list() -> None:
     budget = NoveltyBudget(exploration=0.5, anchor_ratio=0.5, anchor_every_n=2)
     assert apply_novelty_budget([], {"a1"}, budget) == []
+
+
+def test_anchors_pulled_forward_in_ranked_order() -> None:
+    candidates = ["n1", "n2", "n3", "n4", "a1", "n5", "a2", "a3"]
+    anchors = {"a1", "a2", "a3"}
+    budget = NoveltyBudget(exploration=0.2, anchor_ratio=0.8, anchor_every_n=2)
+
+    sequenced = apply_novelty_budget(candidates, anchors, budget)
+
+    assert sequenced == ["n1", "a1", "n2", "a2", "n3", "a3", "n4", "n5"]
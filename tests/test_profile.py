@@ -108,6 +108,21 @@ def test_generate_profile_stats_and_comparisons() -> None:
     assert abs_diffs == sorted(abs_diffs, reverse=True)
 
 
+def test_generate_profile_reads_a_read_only_database(tmp_path: Path) -> None:
+    db_path = tmp_path / "profile.db"
+    with sqlite3.connect(db_path) as connection:
+        _seed_profile_data(connection)
+    connection.close()
+
+    read_only = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        profile = generate_profile(read_only, mode_selectors=["10"])
+    finally:
+        read_only.close()
+
+    assert profile["inputs"]["liked_songs"] == 4
+
+
 def test_cli_profile_writes_json_and_schema_keys(tmp_path: Path) -> None:
     db_path = tmp_path / "profile.db"
     out_path = tmp_path / "musical_dna_v1.json"
@@ -208,3 +223,19 @@ def test_cli_profile_report_writes_deterministic_markdown(tmp_path: Path) -> Non
     assert "generated_at: `2026-01-10T00:00:00+00:00`" in content
     assert "## Global summary" in content
     assert "## Mode summaries" in content
+
+
+def test_single_mode_profile_has_no_comparisons() -> None:
+    connection = sqlite3.connect(":memory:")
+    _seed_profile_data(connection)
+
+    profile = generate_profile(
+        connection,
+        mode_selectors=["10"],
+        include_top_tracks_playlist=None,
+        include_radar_playlist=None,
+    )
+
+    assert len(profile["mode_profiles"]) == 1
+    assert profile["comparisons"] == []
+    assert profile["global_profile"]["track_count"] == 4
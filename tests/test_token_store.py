@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import stat
 import time
+from dataclasses import replace
 from pathlib import Path
 
 from spotifygpt.auth import OAuthConfig, OAuthTokenResponse
@@ -74,4 +75,87 @@ def test_get_access_token_refreshes_when_expired(tmp_path: Path, monkeypatch) ->
 
     assert token == "fresh-token"
     assert store.load() is not None
-    assert store.load().refresh_token == "refresh-1"
\ No newline at end of file
+    assert store.load().refresh_token == "refresh-1"
+
+
+def test_load_reuses_cached_token_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    store = TokenStore(path)
+    store.store_from_oauth(
+        OAuthTokenResponse(
+            access_token="access-1",
+            token_type="Bearer",
+            expires_in=3600,
+            refresh_token="refresh-1",
+            scope="scope",
+        )
+    )
+
+    first = store.load()
+    assert store.load() is first
+
+    TokenStore(path).store_from_oauth(
+        OAuthTokenResponse(
+            access_token="access-2-rotated",
+            token_type="Bearer",
+            expires_in=3600,
+            refresh_token="refresh-2",
+            scope="scope",
+        )
+    )
+
+    reloaded = store.load()
+    assert reloaded is not None
+    assert reloaded.access_token == "access-2-rotated"
+
+    path.unlink()
+    assert store.load() is None
+
+
+def test_load_notices_rewrite_with_same_mtime_and_size(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    store = TokenStore(path)
+    response = OAuthTokenResponse(
+        access_token="access-1",
+        token_type="Bearer",
+        expires_in=3600,
+        refresh_token="refresh-1",
+        scope="scope",
+    )
+    store.store_from_oauth(response)
+    first = store.load()
+    assert first is not None
+    before = path.stat()
+
+    TokenStore(path).save(replace(first, access_token="access-9"))
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+    assert path.stat().st_size == before.st_size
+    assert store.load().access_token == "access-9"
+
+
+def test_save_replaces_existing_file_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "tokens.json"
+    path.write_text("stale", encoding="utf-8")
+    os.chmod(path, 0o644)
+    # Another saver's in-progress temp file must be left alone.
+    other_temp = tmp_path / "tokens.json.tmp"
+    other_temp.write_text("in progress", encoding="utf-8")
+
+    TokenStore(path).store_from_oauth(
+        OAuthTokenResponse(
+            access_token="access-1",
+            token_type="Bearer",
+            expires_in=3600,
+            refresh_token="refresh-1",
+            scope="scope",
+        )
+    )
+
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["tokens.json", "tokens.json.tmp"]
+    assert other_temp.read_text(encoding="utf-8") == "in progress"
+    loaded = TokenStore(path).load()
+    assert loaded is not None
+    assert loaded.access_token == "access-1"
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(path).st_mode) == stat.S_IRUSR | stat.S_IWUSR
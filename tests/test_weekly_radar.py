@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import sqlite3
 
-from spotifygpt.importer import Stream, compute_track_key
-from spotifygpt.weekly_radar import generate_weekly_radar
+from spotifygpt.importer import Stream, compute_track_key, init_db, store_streams
+from spotifygpt.weekly_radar import generate_weekly_radar, generate_weekly_radar_from_db
 
 
 def _make_streams(track_count: int = 45) -> list[Stream]:
@@ -48,3 +49,18 @@ def test_weekly_radar_block_ordering() -> None:
     assert ranks == sorted(ranks)
     assert ranks[0] == 0
     assert ranks[-1] == 2
+
+
+def test_weekly_radar_from_db_matches_in_memory_streams() -> None:
+    streams = _make_streams(track_count=8)
+    # Equal totals and play counts exercise the name and first-seen tie-breaks.
+    streams += [
+        Stream("Tied B", "Artist T", "2024-01-02T08:00:00", 300_000, compute_track_key("Tied B", "Artist T")),
+        Stream("Tied A", "Artist T", "2024-01-02T08:01:00", 300_000, compute_track_key("Tied A", "Artist T")),
+        Stream("Tied A", "Artist U", "2024-01-02T08:02:00", 300_000, compute_track_key("Tied A", "Artist U")),
+    ]
+    connection = sqlite3.connect(":memory:")
+    init_db(connection)
+    store_streams(connection, streams)
+
+    assert generate_weekly_radar_from_db(connection) == generate_weekly_radar(streams)